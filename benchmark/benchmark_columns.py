@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+열 단위(read_columns) 읽기 벤치마크
+
+숫자와 날짜가 대부분인 시트를 메모리에서 생성하여
+CSV 로 변환한 뒤 다시 읽어 열별 NumPy 배열을 만드는 기존 방식
+(pandas 가 있으면 pandas.read_csv, 없으면 csv.reader + numpy)과
+Xlsx2csv.read_columns 로 열 배치를 바로 받는 방식의 처리 시간과
+tracemalloc 기준 최대 메모리 할당량을 비교합니다. numpy 가 필요합니다.
+열의 dtype 과 다른 타입의 값이 뒤 배치에 나오면 변환하지 않고 마스킹하는지도 확인합니다.
+"""
+
+import os
+import sys
+import io
+import csv
+import time
+import zipfile
+import argparse
+import datetime
+import tracemalloc
+
+import numpy
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv
+from benchmark_typed import build_numeric_sheet, COLUMNS, MAIN_NS
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+def csv_columns(xlsx_bytes, num_cols):
+    """CSV 로 변환 후 다시 파싱하여 열 배열 생성 (기준선)"""
+    buf = io.StringIO()
+    with Xlsx2csv(io.BytesIO(xlsx_bytes), dateformat='%Y-%m-%d') as xlsx2csv:
+        xlsx2csv.convert(buf)
+    buf.seek(0)
+    if pandas is not None:
+        frame = pandas.read_csv(buf, header=None)
+        return [frame[i].to_numpy() for i in range(num_cols)]
+    columns = list(zip(*csv.reader(buf)))
+    dtypes = [numpy.float64, numpy.float64, numpy.float64, 'datetime64[us]']
+    return [numpy.array(columns[i], dtype=dtypes[i % len(COLUMNS)]) for i in range(num_cols)]
+
+
+def read_columns(xlsx_bytes, num_cols):
+    with Xlsx2csv(io.BytesIO(xlsx_bytes)) as xlsx2csv:
+        batches = list(xlsx2csv.read_columns(batch_rows=8192))
+    # 열의 dtype 은 배치가 바뀌어도 같아야 함
+    assert all([c.dtype for c in batch] == [c.dtype for c in batches[0]] for batch in batches)
+    return [numpy.ma.concatenate([batch[i] for batch in batches]) for i in range(num_cols)]
+
+
+def build_mixed_sheet():
+    """앞 3행으로 dtype 이 정해진 뒤 다른 타입의 값이 나오는 xlsx 를 메모리에서 생성
+    (A: 날짜 뒤 숫자와 날짜 같은 텍스트, B: 숫자 뒤 숫자 같은 텍스트와 불리언)"""
+    rows = ['<c r="A%d" s="1"><v>%d</v></c><c r="B%d"><v>%d.5</v></c>' % (r, 44000 + r, r, r) for r in (1, 2, 3)]
+    rows.append('<c r="A4"><v>5</v></c><c r="B4" t="inlineStr"><is><t>123</t></is></c>')
+    rows.append('<c r="A5" t="inlineStr"><is><t>2021-03-04</t></is></c><c r="B5" t="b"><v>1</v></c>')
+    rows.append('<c r="A6" s="1"><v>44010</v></c><c r="B6"><v>7</v></c>')
+    sheet = ''.join('<row r="%d">%s</row>' % (r, cells) for r, cells in enumerate(rows, 1))
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml',
+                    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                    '<Override PartName="/xl/styles.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/></Types>')
+        zf.writestr('xl/workbook.xml',
+                    '<workbook xmlns="%s"><sheets><sheet name="Sheet1" sheetId="1"/></sheets></workbook>' % MAIN_NS)
+        zf.writestr('xl/styles.xml', '<styleSheet xmlns="%s"><cellXfs count="2"><xf numFmtId="0"/>'
+                                     '<xf numFmtId="14"/></cellXfs></styleSheet>' % MAIN_NS)
+        zf.writestr('xl/worksheets/sheet1.xml',
+                    '<worksheet xmlns="%s"><sheetData>%s</sheetData></worksheet>' % (MAIN_NS, sheet))
+    return buf.getvalue()
+
+
+def check_mixed():
+    """타입이 섞인 열: dtype 은 유지되고 맞지 않는 값은 마스킹"""
+    with Xlsx2csv(io.BytesIO(build_mixed_sheet())) as xlsx2csv:
+        batches = list(xlsx2csv.read_columns(batch_rows=3))
+    dates = numpy.ma.concatenate([batch[0] for batch in batches])
+    numbers = numpy.ma.concatenate([batch[1] for batch in batches])
+    assert dates.dtype == numpy.dtype('datetime64[us]') and numbers.dtype == numpy.float64
+    assert dates.mask.tolist() == [False, False, False, True, True, False], dates
+    assert numbers.mask.tolist() == [False, False, False, True, True, False], numbers
+    assert dates[5] == numpy.datetime64(datetime.datetime(2020, 6, 28)) and numbers[5] == 7.0
+
+
+def measure(func, *args):
+    """(초, 최대 할당 바이트) 반환"""
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak - base
+
+
+def main():
+    parser = argparse.ArgumentParser(description='열 단위 읽기 벤치마크')
+    parser.add_argument('--rows', type=int, default=50000, help='행 수 (기본: 50000)')
+    parser.add_argument('--cols', type=int, default=20, help='열 수 (기본: 20)')
+    args = parser.parse_args()
+
+    check_mixed()
+    xlsx_bytes = build_numeric_sheet(args.rows, args.cols)
+    for expected, column in zip(csv_columns(xlsx_bytes, args.cols), read_columns(xlsx_bytes, args.cols)):
+        assert len(expected) == len(column)
+        if column.dtype == numpy.float64:
+            assert numpy.allclose(expected.astype(numpy.float64), column.filled(numpy.nan))
+
+    print(f"\n{'='*70}")
+    print(f"📊 열 단위 읽기 벤치마크 ({args.rows:,}행 x {args.cols}열)")
+    print(f"{'='*70}\n")
+    print(f"{'방식':<32} {'시간(초)':>10} {'최대 할당(MB)':>16}")
+    print("-" * 70)
+    baseline = 'CSV + pandas.read_csv' if pandas is not None else 'CSV + csv.reader + numpy'
+    for label, func in ((baseline + ' (기준선)', csv_columns), ('read_columns', read_columns)):
+        elapsed, peak = measure(func, xlsx_bytes, args.cols)
+        print(f"{label:<32} {elapsed:>10.2f} {peak / 1024 / 1024:>16.1f}")
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
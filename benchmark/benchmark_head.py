@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+행 범위(rows / head) 조기 종료 벤치마크
+
+행이 많은 시트를 메모리에서 생성하여 전체 변환과
+--head, --rows 로 앞부분만 변환할 때의 처리 시간을 비교하고,
+결과가 전체 변환 결과의 해당 부분과 같은지 확인합니다.
+column_names 와 함께 쓰면 범위 앞의 첫 행에서 열 이름을 찾아야 하므로 그 경우도 확인합니다.
+마지막 행을 쓰면 파싱과 압축 해제를 멈추므로 시간이 시트 크기와 무관해야 합니다.
+"""
+
+import os
+import sys
+import io
+import time
+import argparse
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv
+from benchmark_rows import build_wide_sheet
+
+
+def convert(xlsx_bytes, **options):
+    buf = io.StringIO()
+    with Xlsx2csv(io.BytesIO(xlsx_bytes), **options) as xlsx2csv:
+        xlsx2csv.convert(buf)
+    return buf.getvalue()
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='행 범위 조기 종료 벤치마크')
+    parser.add_argument('--rows', type=int, default=200000, help='행 수 (기본: 200000)')
+    parser.add_argument('--cols', type=int, default=10, help='열 수 (기본: 10)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (기본: 3)')
+    args = parser.parse_args()
+
+    xlsx_bytes = build_wide_sheet(args.rows, args.cols, 1.0)
+    lines = convert(xlsx_bytes).splitlines(True)
+    # 첫 행(0, 1, 2, ...)을 머리글로 보고 열 이름으로 선택
+    named = convert(xlsx_bytes, column_names=['3', '1']).splitlines(True)
+
+    print(f"\n{'='*70}")
+    print(f"⏩ 행 범위 조기 종료 벤치마크 ({args.rows:,}행 x {args.cols}열)")
+    print(f"{'='*70}\n")
+    print(f"{'옵션':<24} {'시간(ms)':>12} {'전체 대비':>12}")
+    print("-" * 70)
+    full = best_of(lambda: convert(xlsx_bytes), 1) * 1000
+    print(f"{'전체 변환':<24} {full:>12.1f}")
+    for label, options, expected in (('head=10', {'head': 10}, lines[:10]),
+                                     ('rows=1000:1100', {'rows': '1000:1100'}, lines[999:1100]),
+                                     ('rows=100000:100010', {'rows': '100000:100010'}, lines[99999:100010]),
+                                     ('rows=1000:1100 + 이름', {'rows': '1000:1100', 'column_names': ['3', '1']},
+                                      named[999:1100])):
+        assert convert(xlsx_bytes, **options) == "".join(expected), label
+        elapsed = best_of(lambda: convert(xlsx_bytes, **options), args.repeat) * 1000
+        print(f"{label:<24} {elapsed:>12.1f} {elapsed / full:>11.1%}")
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
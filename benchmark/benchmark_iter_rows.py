@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+행 반복자(iter_rows) 벤치마크
+
+CSV 를 StringIO 에 쓴 뒤 csv.reader 로 다시 읽어 행 목록을 얻는 기존 방식과
+Xlsx2csv.iter_rows / iter_row_batches 로 행을 바로 받는 방식의 처리 시간과
+tracemalloc 기준 최대 메모리 할당량을 비교하고, 세 방식의 결과가 같은지 확인합니다.
+"""
+
+import os
+import sys
+import io
+import csv
+import time
+import argparse
+import tracemalloc
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv
+from benchmark_rows import build_wide_sheet
+
+
+def round_trip(xlsx2csv):
+    """CSV 직렬화 후 다시 파싱 (기준선)"""
+    buf = io.StringIO()
+    xlsx2csv.convert(buf)
+    buf.seek(0)
+    for row in csv.reader(buf):
+        yield row
+
+
+def batched(xlsx2csv):
+    for batch in xlsx2csv.iter_row_batches():
+        for row in batch:
+            yield row
+
+
+def measure(xlsx_bytes, rows_of):
+    """(초, 최대 할당 바이트, 행 개수) 반환"""
+    with Xlsx2csv(io.BytesIO(xlsx_bytes)) as xlsx2csv:
+        start = time.perf_counter()
+        count = sum(1 for _ in rows_of(xlsx2csv))
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in rows_of(xlsx2csv):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak - base, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='행 반복자 벤치마크')
+    parser.add_argument('--rows', type=int, default=20000, help='행 수 (기본: 20000)')
+    parser.add_argument('--cols', type=int, default=30, help='열 수 (기본: 30)')
+    args = parser.parse_args()
+
+    xlsx_bytes = build_wide_sheet(args.rows, args.cols, 1.0)
+    with Xlsx2csv(io.BytesIO(xlsx_bytes)) as xlsx2csv:
+        expected = list(round_trip(xlsx2csv))
+        assert list(xlsx2csv.iter_rows()) == expected
+        assert list(batched(xlsx2csv)) == expected
+
+    print(f"\n{'='*70}")
+    print(f"🔁 행 반복자 벤치마크 ({args.rows:,}행 x {args.cols}열)")
+    print(f"{'='*70}\n")
+    print(f"{'방식':<32} {'시간(초)':>10} {'최대 할당(MB)':>16}")
+    print("-" * 70)
+    for label, rows_of in (('StringIO + csv.reader (기준선)', round_trip),
+                           ('iter_rows', lambda x: x.iter_rows()),
+                           ('iter_row_batches', batched)):
+        elapsed, peak, count = measure(xlsx_bytes, rows_of)
+        assert count == len(expected)
+        print(f"{label:<32} {elapsed:>10.2f} {peak / 1024 / 1024:>16.1f}")
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
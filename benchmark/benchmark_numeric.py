@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+숫자 셀 포맷팅 마이크로 벤치마크
+
+기존 방식(정규식 + float + Decimal + "%f" / rstrip)과
+FloatFormat 의 빠른 경로를 셀 단위 비용(ns/셀)으로 비교합니다.
+"""
+
+import os
+import sys
+import re
+import random
+import timeit
+import argparse
+from decimal import Decimal
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import FloatFormat, split_decimal, FLOAT_VALUE_RE
+
+
+def legacy_format(data, format_str, floatformat=None):
+    """이전 Sheet.handleCharData 의 float 분기 (기준선)"""
+    if not re.match(r"^-?\d+(.\d+)?$", data):
+        return data
+    value = float(data)
+    if not floatformat and value.is_integer():
+        return "%i" % Decimal(repr(float(data)))
+    elif ('E' in data or 'e' in data) or floatformat:
+        return str(floatformat or '%f') % value
+    elif format_str == 'general':
+        return ("%f" % value).rstrip('0').rstrip('.')
+    elif format_str[0:3] == '0.0':
+        L = len(format_str.split(".")[1])
+        if '%' in format_str:
+            L += 1
+        return ("%." + str(L) + "f") % value
+    return ("%f" % value).rstrip('0').rstrip('.')
+
+
+def make_fast_format(format_str, floatformat=None):
+    """현재 Sheet 가 사용하는 분류 + FloatFormat 경로"""
+    render = FloatFormat(format_str, floatformat).format
+
+    def fast_format(data):
+        if split_decimal(data) is None and not FLOAT_VALUE_RE.match(data):
+            return data
+        return render(data)
+    return fast_format
+
+
+def make_samples(kind, count=10000, seed=42):
+    """벤치마크용 셀 값 생성"""
+    rnd = random.Random(seed)
+    if kind == 'integer':
+        return [str(rnd.randrange(-10 ** 9, 10 ** 9)) for _ in range(count)]
+    if kind == 'decimal':
+        return ['%.2f' % (rnd.random() * 100000) for _ in range(count)]
+    if kind == 'mixed':
+        return [rnd.choice([str(rnd.randrange(10 ** 6)), '%.4f' % rnd.random(), '%.2f' % (rnd.random() * 1000)])
+                for _ in range(count)]
+    raise ValueError(kind)
+
+
+def measure(func, samples, repeat):
+    """셀 하나당 평균 나노초"""
+    def run():
+        for value in samples:
+            func(value)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(samples) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description='숫자 셀 포맷팅 마이크로 벤치마크')
+    parser.add_argument('--cells', type=int, default=10000, help='샘플 셀 수 (기본: 10000)')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (기본: 5)')
+    args = parser.parse_args()
+
+    cases = [
+        ('integer', 'general'),
+        ('decimal', 'general'),
+        ('decimal', '0.00'),
+        ('mixed', 'general'),
+        ('mixed', '0.000'),
+    ]
+
+    print(f"\n{'='*70}")
+    print("🔢 숫자 셀 포맷팅 비용 (ns/셀)")
+    print(f"{'='*70}\n")
+    print(f"{'샘플':<10} {'포맷':<10} {'기존':>12} {'현재':>12} {'속도향상':>12}")
+    print("-" * 70)
+
+    for kind, format_str in cases:
+        samples = make_samples(kind, args.cells)
+        fast_format = make_fast_format(format_str)
+        for value in samples:
+            assert fast_format(value) == legacy_format(value, format_str), value
+
+        before = measure(lambda v: legacy_format(v, format_str), samples, args.repeat)
+        after = measure(fast_format, samples, args.repeat)
+        print(f"{kind:<10} {format_str:<10} {before:>12.1f} {after:>12.1f} {before / after:>11.2f}x")
+
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+워크북 열기 지연시간 벤치마크
+
+cellXfs 가 많은 스타일 파트와 시트가 많은 워크북을 메모리에서 생성하여
+Xlsx2csv 를 열고 스타일까지 로드하는 데 걸리는 시간을 측정합니다.
+이전 minidom 기반 파서(기준선)와 현재 스트리밍 파서의 메타데이터 파싱 시간을 비교하고
+두 결과가 같은지 확인합니다.
+"""
+
+import os
+import sys
+import io
+import time
+import zipfile
+import argparse
+from xml.dom import minidom
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv, Styles, Workbook, STANDARD_FORMATS
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+def build_workbook(num_xfs, num_sheets):
+    """스타일이 많고 시트가 많은 xlsx 를 메모리에서 생성"""
+    num_fmts = ''.join('<numFmt numFmtId="%d" formatCode="0.%s"/>' % (164 + i, '0' * (i % 6 + 1))
+                       for i in range(50))
+    xfs = ''.join('<xf numFmtId="%d" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+                  % (164 + i % 50 if i % 3 else i % 22) for i in range(num_xfs))
+    styles = ('<styleSheet xmlns="%s"><numFmts count="50">%s</numFmts>'
+              '<cellXfs count="%d">%s</cellXfs></styleSheet>' % (MAIN_NS, num_fmts, num_xfs, xfs))
+    sheets = ''.join('<sheet name="Sheet%d" sheetId="%d" r:id="rId%d"/>' % (i, i, i)
+                     for i in range(1, num_sheets + 1))
+    workbook = ('<workbook xmlns="%s" xmlns:r="%s"><fileVersion appName="xl"/><workbookPr/>'
+                '<sheets>%s</sheets></workbook>' % (MAIN_NS, REL_NS, sheets))
+    rels = ''.join('<Relationship Id="rId%d" Type="%s/worksheet" Target="worksheets/sheet%d.xml"/>'
+                   % (i, REL_NS, i) for i in range(1, num_sheets + 1))
+    overrides = ''.join('<Override PartName="/xl/worksheets/sheet%d.xml" ContentType="application/'
+                        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>' % i
+                        for i in range(1, num_sheets + 1))
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml',
+                    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                    '<Override PartName="/xl/styles.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>%s</Types>' % overrides)
+        zf.writestr('xl/workbook.xml', workbook)
+        zf.writestr('xl/_rels/workbook.xml.rels',
+                    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                    '%s</Relationships>' % rels)
+        zf.writestr('xl/styles.xml', styles)
+        for i in range(1, num_sheets + 1):
+            zf.writestr('xl/worksheets/sheet%d.xml' % i,
+                        '<worksheet xmlns="%s"><sheetData/></worksheet>' % MAIN_NS)
+    return buf.getvalue()
+
+
+def legacy_parse_styles(data):
+    """이전 Styles.parse (minidom, 기준선)"""
+    numFmts, cellXfs = {}, []
+    styles = minidom.parseString(data).firstChild
+    element = styles.getElementsByTagNameNS(styles.namespaceURI, "numFmts")
+    if len(element) == 1:
+        for numFmt in element[0].childNodes:
+            if numFmt.nodeType == minidom.Node.ELEMENT_NODE:
+                numFmts[int(numFmt._attrs['numFmtId'].value)] = \
+                    numFmt._attrs['formatCode'].value.lower().replace('\\', '')
+    element = styles.getElementsByTagNameNS(styles.namespaceURI, "cellXfs")
+    if len(element) == 1:
+        for xf in element[0].childNodes:
+            if xf.nodeType != minidom.Node.ELEMENT_NODE or not (xf.nodeName == "xf" or xf.nodeName.endswith(":xf")):
+                continue
+            if xf._attrs and 'numFmtId' in xf._attrs:
+                numFmtId = int(xf._attrs['numFmtId'].value)
+                if numFmtId not in numFmts and numFmtId not in STANDARD_FORMATS:
+                    numFmtId = int(xf._attrs['applyNumberFormat'].value)
+                cellXfs.append(numFmtId)
+            else:
+                cellXfs.append(None)
+    return numFmts, cellXfs
+
+
+def legacy_parse_sheets(data):
+    """이전 Workbook.parse 의 시트 목록 부분 (minidom, 기준선)"""
+    doc = minidom.parseString(data).firstChild
+    sheets = doc.getElementsByTagNameNS(doc.namespaceURI, "sheets")[0]
+    return [node._attrs["name"].value for node in sheets.getElementsByTagNameNS(doc.namespaceURI, "sheet")]
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='워크북 열기 지연시간 벤치마크')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (기본: 5)')
+    args = parser.parse_args()
+
+    print(f"\n{'='*78}")
+    print("📂 워크북 열기 지연시간 (밀리초)")
+    print(f"{'='*78}\n")
+    print(f"{'cellXfs':>8} {'시트':>6} {'minidom 파싱':>14} {'스트리밍 파싱':>14} {'속도향상':>10} {'열기+스타일':>14}")
+    print("-" * 78)
+
+    for num_xfs, num_sheets in ((1000, 10), (20000, 100), (60000, 500)):
+        xlsx_bytes = build_workbook(num_xfs, num_sheets)
+        with zipfile.ZipFile(io.BytesIO(xlsx_bytes)) as zf:
+            styles_xml = zf.read('xl/styles.xml')
+            workbook_xml = zf.read('xl/workbook.xml')
+
+        def streaming():
+            styles = Styles()
+            styles.parse(io.BytesIO(styles_xml))
+            workbook = Workbook()
+            workbook.parse(io.BytesIO(workbook_xml))
+            return styles, workbook
+
+        def legacy():
+            return legacy_parse_styles(styles_xml), legacy_parse_sheets(workbook_xml)
+
+        styles, workbook = streaming()
+        (numFmts, cellXfs), sheet_names = legacy()
+        assert styles.numFmts == numFmts and styles.cellXfs == cellXfs
+        assert [s['name'] for s in workbook.sheets] == sheet_names
+
+        def open_workbook():
+            with Xlsx2csv(io.BytesIO(xlsx_bytes)) as xlsx2csv:
+                xlsx2csv.styles
+
+        before = best_of(legacy, args.repeat) * 1000
+        after = best_of(streaming, args.repeat) * 1000
+        opened = best_of(open_workbook, args.repeat) * 1000
+        print(f"{num_xfs:>8,} {num_sheets:>6,} {before:>14.1f} {after:>14.1f} {before / after:>9.2f}x {opened:>14.1f}")
+
+    print("-" * 78)
+
+
+if __name__ == '__main__':
+    main()
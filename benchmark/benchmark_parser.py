@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+XML 파서 백엔드 비교 벤치마크
+
+같은 워크북을 expat(기본) 과 lxml iterparse 백엔드로 각각 변환하여
+변환 시간과 tracemalloc 기준 최대 메모리 할당량을 나란히 비교합니다.
+lxml 이 설치되지 않은 환경에서는 expat 만 측정합니다.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv, XlsxException, PARSERS, get_parser
+
+
+class NullFile:
+    """출력 버퍼가 측정값에 섞이지 않도록 쓰기를 버리는 파일 객체"""
+
+    def write(self, data):
+        return len(data)
+
+
+def available_parsers():
+    """현재 환경에서 사용 가능한 파서 백엔드 이름 목록"""
+    names = []
+    for name in sorted(PARSERS):
+        try:
+            get_parser(name)
+        except XlsxException:
+            continue
+        names.append(name)
+    return names
+
+
+def measure(xlsx_path, parser, sheetid, repeat):
+    """(최소 변환 시간(초), 최대 할당 바이트) 반환"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with Xlsx2csv(xlsx_path, parser=parser) as xlsx2csv:
+            xlsx2csv.convert(NullFile(), sheetid)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    with Xlsx2csv(xlsx_path, parser=parser) as xlsx2csv:
+        xlsx2csv.convert(NullFile(), sheetid)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='XML 파서 백엔드 비교 벤치마크')
+    parser.add_argument('files', nargs='+', help='측정할 xlsx 파일')
+    parser.add_argument('-s', '--sheet', type=int, default=0, help='시트 번호 (기본: 0, 모든 시트)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (기본: 3)')
+    args = parser.parse_args()
+
+    parsers = available_parsers()
+    if len(parsers) < 2:
+        print("⚠️  lxml 이 설치되지 않아 expat 만 측정합니다 (pip install lxml)")
+
+    print(f"\n{'='*70}")
+    print("🧪 XML 파서 백엔드 비교")
+    print(f"{'='*70}\n")
+    print(f"{'파일':<30} {'파서':<8} {'시간(초)':>12} {'최대 할당(MB)':>16}")
+    print("-" * 70)
+
+    for path in args.files:
+        if not os.path.exists(path):
+            print(f"❌ 파일을 찾을 수 없습니다: {path}")
+            continue
+        results = {}
+        for name in parsers:
+            elapsed, peak = measure(path, name, args.sheet, args.repeat)
+            results[name] = elapsed
+            print(f"{os.path.basename(path)[:30]:<30} {name:<8} {elapsed:>12.3f} {peak / 1024 / 1024:>16.2f}")
+        fastest = min(results, key=results.get)
+        print(f"{'':<30} ✅ 가장 빠른 파서: {fastest}")
+
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
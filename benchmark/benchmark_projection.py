@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+열 선택(columns) 벤치마크
+
+열이 많은 시트를 메모리에서 생성하여 전체 열을 변환한 뒤 필요한 열만 고르는 방식과
+columns 옵션으로 선택한 열만 변환하는 방식의 처리 시간을 비교하고 결과가 같은지 확인합니다.
+모든 열을 고르는 경우(A:마지막 열)는 선택하지 않은 변환보다 느리지 않아야 합니다.
+"""
+
+import os
+import sys
+import io
+import csv
+import time
+import argparse
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv, parse_columns
+from benchmark_rows import build_wide_sheet, column_name
+
+
+def convert(xlsx_bytes, **options):
+    buf = io.StringIO()
+    with Xlsx2csv(io.BytesIO(xlsx_bytes), **options) as xlsx2csv:
+        xlsx2csv.convert(buf)
+    return buf.getvalue()
+
+
+def select_columns(text, columns):
+    """전체 CSV 에서 열 선택 (기준선 결과 비교용)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    for row in csv.reader(io.StringIO(text)):
+        writer.writerow([row[c] if c < len(row) else "" for c in columns])
+    return buf.getvalue()
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='열 선택 벤치마크')
+    parser.add_argument('--rows', type=int, default=2000, help='행 수 (기본: 2000)')
+    parser.add_argument('--cols', type=int, default=300, help='열 수 (기본: 300)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (기본: 3)')
+    args = parser.parse_args()
+
+    xlsx_bytes = build_wide_sheet(args.rows, args.cols, 1.0, dimension=True)
+
+    print(f"\n{'='*70}")
+    print(f"✂️  열 선택 벤치마크 ({args.rows:,}행 x {args.cols}열)")
+    print(f"{'='*70}\n")
+    print(f"{'columns':<20} {'전체 변환(초)':>14} {'열 선택(초)':>14} {'속도향상':>12}")
+    print("-" * 70)
+    full = best_of(lambda: convert(xlsx_bytes), args.repeat)
+    for spec in ('A,C,F:H', 'A:E,KN', 'A:CV', 'A:' + column_name(args.cols - 1)):
+        assert convert(xlsx_bytes, columns=spec) == select_columns(convert(xlsx_bytes), parse_columns(spec))
+        projected = best_of(lambda: convert(xlsx_bytes, columns=spec), args.repeat)
+        print(f"{spec:<20} {full:>14.2f} {projected:>14.2f} {full / projected:>11.2f}x")
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
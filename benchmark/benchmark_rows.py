@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+행 조립(row assembly) 벤치마크
+
+넓은 시트를 메모리에서 생성하여 Sheet.to_csv 의 행당 처리 시간과
+tracemalloc 기준 최대 메모리 할당량을 측정합니다.
+행 수를 늘려도 최대 할당량이 일정하게 유지되는지(행당 할당이 제한되는지) 확인합니다.
+"""
+
+import os
+import sys
+import io
+import time
+import zipfile
+import argparse
+import tracemalloc
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv
+
+
+def column_name(c):
+    """0 부터 시작하는 열 번호를 열 이름(A, B, ..., AA, ...)으로 변환"""
+    name = ""
+    while c >= 0:
+        name = chr(c % 26 + 65) + name
+        c = c // 26 - 1
+    return name
+
+
+def build_wide_sheet(num_rows, num_cols, fill_ratio, dimension=False):
+    """열이 많은 시트를 가진 xlsx 를 메모리에서 생성 (dimension=True 이면 Excel 처럼 <dimension> 포함)"""
+    step = max(1, int(round(1 / fill_ratio)))
+    rows = []
+    for r in range(1, num_rows + 1):
+        cells = []
+        for c in range(0, num_cols, step):
+            cells.append('<c r="%s%d"><v>%d</v></c>' % (column_name(c), r, r * c))
+        rows.append('<row r="%d">%s</row>' % (r, "".join(cells)))
+    dim = '<dimension ref="A1:%s%d"/>' % (column_name(num_cols - 1), num_rows) if dimension else ''
+    sheet = ('<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+             '%s<sheetData>%s</sheetData></worksheet>' % (dim, "".join(rows)))
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml',
+                    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"/>')
+        zf.writestr('xl/workbook.xml',
+                    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    '<sheets><sheet name="Sheet1" sheetId="1"/></sheets></workbook>')
+        zf.writestr('xl/worksheets/sheet1.xml', sheet)
+    return buf.getvalue()
+
+
+class NullFile:
+    """출력 버퍼가 측정값에 섞이지 않도록 쓰기를 버리는 파일 객체"""
+
+    def write(self, data):
+        return len(data)
+
+
+def measure(xlsx_bytes, num_rows, **options):
+    """(행당 마이크로초, 최대 할당 바이트) 반환"""
+    with Xlsx2csv(io.BytesIO(xlsx_bytes), **options) as xlsx2csv:
+        start = time.perf_counter()
+        xlsx2csv.convert(NullFile())
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        xlsx2csv.convert(NullFile())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed / num_rows * 1e6, peak - base
+
+
+def main():
+    parser = argparse.ArgumentParser(description='행 조립 벤치마크')
+    parser.add_argument('--cols', type=int, default=300, help='열 수 (기본: 300)')
+    parser.add_argument('--fill', type=float, default=0.5, help='채워진 셀 비율 (기본: 0.5)')
+    args = parser.parse_args()
+
+    print(f"\n{'='*70}")
+    print(f"🧱 행 조립 벤치마크 ({args.cols}열, 채움 비율 {args.fill:.0%})")
+    print(f"{'='*70}\n")
+    print(f"{'행 수':>10} {'옵션':<28} {'µs/행':>12} {'최대 할당(KB)':>16}")
+    print("-" * 70)
+
+    for num_rows in (500, 2000):
+        xlsx_bytes = build_wide_sheet(num_rows, args.cols, args.fill)
+        for label, options in (('기본', {}),
+                               ('skip_trailing_columns', {'skip_trailing_columns': True}),
+                               ('skip_empty_lines', {'skip_empty_lines': True})):
+            per_row, peak = measure(xlsx_bytes, num_rows, **options)
+            print(f"{num_rows:>10,} {label:<28} {per_row:>12.1f} {peak / 1024:>16.1f}")
+
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+공유 문자열 저장소 메모리 벤치마크
+
+고유 문자열이 많은 공유 문자열 테이블을 기본 list 저장소와
+CompactStrings(UTF-8 버퍼 + 오프셋 배열) 저장소에 각각 적재하여
+tracemalloc 기준 메모리 사용량과 임의 접근 비용(ns/조회)을 비교합니다.
+"""
+
+import os
+import sys
+import random
+import timeit
+import argparse
+import tracemalloc
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import CompactStrings
+
+
+def make_strings(count, seed=42):
+    """고유 문자열을 하나씩 생성 (짧은 코드, 이름, 문장이 섞인 형태)"""
+    rnd = random.Random(seed)
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            yield "ID-%08d" % i
+        elif kind == 1:
+            yield "고객 %d 번 %s" % (i, rnd.choice(["서울", "부산", "Seoul", "Busan"]))
+        else:
+            yield "Lorem ipsum dolor sit amet %d consectetur" % i
+
+
+def load(store, strings):
+    for value in strings:
+        store.append(value)
+    return store
+
+
+def measure_memory(factory, count):
+    """파서처럼 문자열을 하나씩 적재한 뒤 남아있는 할당 바이트"""
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    store = load(factory(), make_strings(count))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, current - base
+
+
+def measure_lookup(store, indexes):
+    """조회 하나당 평균 나노초"""
+    def run():
+        for i in indexes:
+            store[i]
+    best = min(timeit.repeat(run, number=1, repeat=3))
+    return best / len(indexes) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description='공유 문자열 저장소 메모리 벤치마크')
+    parser.add_argument('--strings', type=int, default=1000000, help='고유 문자열 수 (기본: 1000000)')
+    parser.add_argument('--lookups', type=int, default=200000, help='조회 횟수 (기본: 200000)')
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    indexes = [rnd.randrange(args.strings) for _ in range(args.lookups)]
+
+    print(f"\n{'='*70}")
+    print(f"🧵 공유 문자열 저장소 비교 ({args.strings:,}개)")
+    print(f"{'='*70}\n")
+    print(f"{'저장소':<28} {'메모리(MB)':>14} {'ns/조회':>12}")
+    print("-" * 70)
+
+    for label, factory in (('list', list),
+                           ('CompactStrings', CompactStrings),
+                           ('CompactStrings (LRU 1024)', lambda: CompactStrings(1024))):
+        store, used = measure_memory(factory, args.strings)
+        per_lookup = measure_lookup(store, indexes)
+        print(f"{label:<28} {used / 1024 / 1024:>14.1f} {per_lookup:>12.1f}")
+
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+CLI 시작 시간 벤치마크
+
+`python -X importtime` 으로 xlsx2csv 모듈의 import 시간을 측정하고
+가장 무거운 import 를 나열합니다. 또한 인터프리터만 띄우는 경우,
+`xlsx2csv.py --version`, 작은 파일 하나 변환의 프로세스 실행 시간을 비교합니다.
+--baseline 으로 다른 버전의 xlsx2csv.py 를 주면 나란히 비교합니다.
+"""
+
+import os
+import sys
+import time
+import zipfile
+import argparse
+import tempfile
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def build_small_workbook(path):
+    """셀 몇 개짜리 작은 xlsx 생성 (배치 작업의 일반적인 입력)"""
+    rows = ''.join('<row r="%d"><c r="A%d"><v>%d</v></c><c r="B%d" t="inlineStr"><is><t>행 %d</t></is></c></row>'
+                   % (r, r, r, r, r) for r in range(1, 21))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml',
+                    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"/>')
+        zf.writestr('xl/workbook.xml',
+                    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    '<sheets><sheet name="Sheet1" sheetId="1"/></sheets></workbook>')
+        zf.writestr('xl/worksheets/sheet1.xml',
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    '<sheetData>%s</sheetData></worksheet>' % rows)
+
+
+def import_times(script):
+    """(xlsx2csv 누적 import 시간(µs), [(누적 µs, 모듈명)] 직접 import 목록) 반환"""
+    module_dir = os.path.dirname(os.path.abspath(script))
+    module = os.path.splitext(os.path.basename(script))[0]
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            cwd=module_dir, capture_output=True, text=True, check=True)
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # 헤더 줄
+        # importtime 은 자식 모듈을 부모보다 먼저 출력함 (들여쓰기 한 단계 = 직접 import)
+        if not name.startswith('   '):
+            if name.strip() == module:
+                return int(cumulative), sorted(children, reverse=True)
+            children = []  # 다른 최상위 import (site 등) 의 자식
+        elif not name.startswith('     '):
+            children.append((int(cumulative), name.strip()))
+    return 0, sorted(children, reverse=True)
+
+
+def best_of(args, repeat):
+    """프로세스 실행 시간(초)의 최솟값"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI 시작 시간 벤치마크')
+    parser.add_argument('--repeat', type=int, default=20, help='반복 횟수 (기본: 20)')
+    parser.add_argument('--top', type=int, default=10, help='표시할 무거운 import 수 (기본: 10)')
+    parser.add_argument('--baseline', help='비교할 다른 버전의 xlsx2csv.py 경로')
+    args = parser.parse_args()
+
+    scripts = [('현재', os.path.join(SRC_DIR, 'xlsx2csv.py'))]
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print(f"❌ 파일을 찾을 수 없습니다: {args.baseline}")
+            return
+        scripts.append(('기준선', args.baseline))
+
+    for label, script in scripts:
+        total, children = import_times(script)
+        print(f"\n{'='*70}")
+        print(f"📦 import 시간 ({label}): {total / 1000:.1f} ms")
+        print(f"{'='*70}\n")
+        print(f"{'모듈':<40} {'누적(ms)':>12}")
+        print("-" * 70)
+        for cumulative, name in children[:args.top]:
+            print(f"{name:<40} {cumulative / 1000:>12.1f}")
+        print("-" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        small = os.path.join(tmp, 'small.xlsx')
+        build_small_workbook(small)
+
+        print(f"\n{'='*70}")
+        print(f"⏱️  프로세스 실행 시간 (최솟값, {args.repeat}회)")
+        print(f"{'='*70}\n")
+        print(f"{'명령':<40} {'버전':<8} {'시간(ms)':>12}")
+        print("-" * 70)
+        interpreter = best_of([sys.executable, '-c', 'pass'], args.repeat)
+        print(f"{'python -c pass':<40} {'':<8} {interpreter * 1000:>12.1f}")
+        for label, script in scripts:
+            for name, extra in (('--version', ['--version']), ('작은 파일 변환', [small])):
+                elapsed = best_of([sys.executable, script] + extra, args.repeat)
+                print(f"{name:<40} {label:<8} {elapsed * 1000:>12.1f}")
+        print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
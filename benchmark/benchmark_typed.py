@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+타입 값(typed_values) 모드 벤치마크
+
+숫자와 날짜가 대부분인 시트를 메모리에서 생성하여
+문자열로 포맷한 행을 받아 다시 int/float/datetime 으로 파싱하는 기존 방식과
+typed_values=True 로 값을 바로 받는 방식의 처리 시간을 비교합니다.
+"""
+
+import os
+import sys
+import io
+import time
+import random
+import zipfile
+import argparse
+import datetime
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+
+# 열 종류: (스타일 인덱스, 값 생성기, 문자열 값을 다시 파싱하는 함수)
+COLUMNS = [
+    (0, lambda rnd: str(rnd.randrange(10 ** 6)), int),
+    (0, lambda rnd: '%.4f' % (rnd.random() * 10000), float),
+    (2, lambda rnd: '%.2f' % (rnd.random() * 1000), float),
+    (1, lambda rnd: str(rnd.randrange(36000, 46000)), lambda s: datetime.datetime.strptime(s, '%Y-%m-%d')),
+]
+
+
+def build_numeric_sheet(num_rows, num_cols, seed=42):
+    """숫자와 날짜 셀로 채운 xlsx 를 메모리에서 생성"""
+    rnd = random.Random(seed)
+    rows = []
+    for r in range(1, num_rows + 1):
+        cells = []
+        for c in range(num_cols):
+            style, make, _ = COLUMNS[c % len(COLUMNS)]
+            cells.append('<c r="%s%d" s="%d"><v>%s</v></c>' % (chr(65 + c % 26) * (c // 26 + 1), r, style, make(rnd)))
+        rows.append('<row r="%d">%s</row>' % (r, ''.join(cells)))
+    styles = ('<styleSheet xmlns="%s"><cellXfs count="3"><xf numFmtId="0"/><xf numFmtId="14"/>'
+              '<xf numFmtId="2"/></cellXfs></styleSheet>' % MAIN_NS)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml',
+                    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                    '<Override PartName="/xl/styles.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/></Types>')
+        zf.writestr('xl/workbook.xml',
+                    '<workbook xmlns="%s"><sheets><sheet name="Sheet1" sheetId="1"/></sheets></workbook>' % MAIN_NS)
+        zf.writestr('xl/styles.xml', styles)
+        zf.writestr('xl/worksheets/sheet1.xml',
+                    '<worksheet xmlns="%s"><sheetData>%s</sheetData></worksheet>' % (MAIN_NS, ''.join(rows)))
+    return buf.getvalue()
+
+
+def string_rows(xlsx_bytes, num_cols):
+    """문자열 행을 받아 다시 파싱 (기준선)"""
+    parsers = [COLUMNS[c % len(COLUMNS)][2] for c in range(num_cols)]
+    with Xlsx2csv(io.BytesIO(xlsx_bytes), dateformat='%Y-%m-%d') as xlsx2csv:
+        for row in xlsx2csv.iter_rows():
+            yield [parse(value) for parse, value in zip(parsers, row)]
+
+
+def typed_rows(xlsx_bytes, num_cols):
+    with Xlsx2csv(io.BytesIO(xlsx_bytes), typed_values=True) as xlsx2csv:
+        for row in xlsx2csv.iter_rows():
+            yield row
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='타입 값 모드 벤치마크')
+    parser.add_argument('--rows', type=int, default=20000, help='행 수 (기본: 20000)')
+    parser.add_argument('--cols', type=int, default=20, help='열 수 (기본: 20)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (기본: 3)')
+    args = parser.parse_args()
+
+    xlsx_bytes = build_numeric_sheet(args.rows, args.cols)
+    for parsed, typed in zip(string_rows(xlsx_bytes, args.cols), typed_rows(xlsx_bytes, args.cols)):
+        for a, b in zip(parsed, typed):
+            assert type(a) is type(b) and (a == b if not isinstance(a, float) else abs(a - b) < 1e-9), (a, b)
+
+    print(f"\n{'='*70}")
+    print(f"🔢 타입 값 모드 벤치마크 ({args.rows:,}행 x {args.cols}열, 숫자/날짜)")
+    print(f"{'='*70}\n")
+    print(f"{'방식':<36} {'시간(초)':>12} {'속도향상':>12}")
+    print("-" * 70)
+    before = best_of(lambda: sum(1 for _ in string_rows(xlsx_bytes, args.cols)), args.repeat)
+    after = best_of(lambda: sum(1 for _ in typed_rows(xlsx_bytes, args.cols)), args.repeat)
+    print(f"{'문자열 포맷 + 다시 파싱 (기준선)':<36} {before:>12.2f}")
+    print(f"{'typed_values':<36} {after:>12.2f} {before / after:>11.2f}x")
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
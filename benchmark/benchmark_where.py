@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+행 조건(where) 필터 벤치마크
+
+문자열과 숫자 열로 이루어진 시트를 메모리에서 생성하여
+전체 행을 변환한 뒤 Python 에서 조건에 맞는 행만 고르는 기존 방식과
+where 옵션으로 원시 셀 값에서 조건을 먼저 검사하는 방식의 처리 시간을 비교하고 결과가 같은지 확인합니다.
+조건에 맞지 않는 행은 포맷과 쓰기를 건너뛰므로 일치하는 행이 적을수록 차이가 커집니다.
+"""
+
+import os
+import sys
+import io
+import csv
+import time
+import random
+import zipfile
+import argparse
+
+# 경로 설정: src 폴더를 path에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from xlsx2csv import Xlsx2csv
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+COUNTRIES = ['KR'] + ['C%02d' % i for i in range(19)]  # KR 이 약 5%
+
+
+def build_orders_sheet(num_rows, num_cols, seed=42):
+    """국가 코드(공유 문자열), 날짜, 숫자 셀로 채운 xlsx 를 메모리에서 생성"""
+    rnd = random.Random(seed)
+    rows = []
+    for r in range(1, num_rows + 1):
+        cells = ['<c r="A%d" t="s"><v>%d</v></c>' % (r, rnd.randrange(len(COUNTRIES))),
+                 '<c r="B%d" s="1"><v>%d</v></c>' % (r, rnd.randrange(36000, 46000))]
+        for c in range(2, num_cols):
+            cells.append('<c r="%s%d" s="2"><v>%.4f</v></c>' % (chr(65 + c), r, rnd.random() * 10000))
+        rows.append('<row r="%d">%s</row>' % (r, ''.join(cells)))
+    strings = ''.join('<si><t>%s</t></si>' % s for s in COUNTRIES)
+    styles = ('<styleSheet xmlns="%s"><cellXfs count="3"><xf numFmtId="0"/><xf numFmtId="14"/>'
+              '<xf numFmtId="2"/></cellXfs></styleSheet>' % MAIN_NS)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml',
+                    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                    '<Override PartName="/xl/styles.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>')
+        zf.writestr('xl/workbook.xml',
+                    '<workbook xmlns="%s"><sheets><sheet name="Sheet1" sheetId="1"/></sheets></workbook>' % MAIN_NS)
+        zf.writestr('xl/styles.xml', styles)
+        zf.writestr('xl/sharedStrings.xml', '<sst xmlns="%s">%s</sst>' % (MAIN_NS, strings))
+        zf.writestr('xl/worksheets/sheet1.xml',
+                    '<worksheet xmlns="%s"><sheetData>%s</sheetData></worksheet>' % (MAIN_NS, ''.join(rows)))
+    return buf.getvalue()
+
+
+def convert(xlsx_bytes, **options):
+    buf = io.StringIO()
+    with Xlsx2csv(io.BytesIO(xlsx_bytes), **options) as xlsx2csv:
+        xlsx2csv.convert(buf)
+    return buf.getvalue()
+
+
+def filter_after(xlsx_bytes, country):
+    """전체 변환 후 Python 에서 행 필터링 (기준선)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    for row in csv.reader(io.StringIO(convert(xlsx_bytes))):
+        if row[0] == country:
+            writer.writerow(row)
+    return buf.getvalue()
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='행 조건 필터 벤치마크')
+    parser.add_argument('--rows', type=int, default=50000, help='행 수 (기본: 50000)')
+    parser.add_argument('--cols', type=int, default=20, help='열 수 (기본: 20)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (기본: 3)')
+    args = parser.parse_args()
+
+    xlsx_bytes = build_orders_sheet(args.rows, args.cols)
+    expected = filter_after(xlsx_bytes, 'KR')
+    assert convert(xlsx_bytes, where=['A=KR']) == expected
+
+    print(f"\n{'='*70}")
+    print(f"🔎 행 조건 필터 벤치마크 ({args.rows:,}행 x {args.cols}열, 일치 {expected.count(chr(10)):,}행)")
+    print(f"{'='*70}\n")
+    print(f"{'방식':<36} {'시간(초)':>12} {'속도향상':>12}")
+    print("-" * 70)
+    before = best_of(lambda: filter_after(xlsx_bytes, 'KR'), args.repeat)
+    after = best_of(lambda: convert(xlsx_bytes, where=['A=KR']), args.repeat)
+    print(f"{'전체 변환 + Python 필터 (기준선)':<36} {before:>12.2f}")
+    print(f"{'where A=KR':<36} {after:>12.2f} {before / after:>11.2f}x")
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
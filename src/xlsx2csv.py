@@ -26,36 +26,17 @@ __author__ = "Dilshod Temirkhodjaev <tdilshod@gmail.com>"
 __license__ = "MIT"
 __version__ = "0.8.4"
 
-import csv, datetime, zipfile, sys, os, re, signal, io
+# the command line runs once per file in batch jobs, so startup matters: modules only some code paths
+# need (argparse, signal, decimal, hashlib, pickle, tempfile, mmap, struct) are imported where they are used
+import csv, datetime, zipfile, sys, os, re, io, functools, itertools
+import bisect
+from array import array
 import xml.parsers.expat
-from decimal import Decimal
-from xml.dom import minidom
 
-try:
-    # python2.4
-    from cStringIO import StringIO
-except:
-    pass
-try:
-    from argparse import ArgumentParser
-except:
-    # python2.4
-    from optparse import OptionParser
-
-try:
-    from typing import Union, Optional, Dict, Any, IO, List, TextIO, BinaryIO
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Union, Optional, Dict, Any, IO, List, TextIO, BinaryIO, Iterator
     from types import TracebackType
-except ImportError:
-    # python2.4 or older versions without typing
-    Union = None
-    Optional = None
-    Dict = None
-    Any = None
-    IO = None
-    List = None
-    TextIO = None
-    BinaryIO = None
-    TracebackType = None
 
 # see also ruby-roo lib at: http://github.com/hmcgowan/roo
 FORMATS = {
@@ -146,6 +127,34 @@ CONTENT_TYPES = set((
     'relationships',
 ))
 
+DATE_FORMAT_RE = re.compile(".*[hsmdyY]")
+ELAPSED_FORMAT_RE = re.compile(r".*\[.*[dmhys].*\]")
+DATE_VALUE_RE = re.compile(r"^\d+(\.\d+)?$")
+FLOAT_VALUE_RE = re.compile(r"^-?\d+(.\d+)?$")
+SCIFLOAT_VALUE_RE = re.compile(r"^-?\d+(.\d+)?([eE]-?\d+)?$")
+NUMBER_VALUE_RE = re.compile(r"^-?\d+(\.\d+)?([eE][-+]?\d+)?$")  # numbers kept as typed values
+CONDITION_RE = re.compile(r"^\s*([A-Za-z]+)\s*(==|!=|<=|>=|=|<|>)\s*(.*?)\s*\Z", re.DOTALL)
+
+COMPARISONS = {
+    "=": lambda a, b: a == b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+# str.translate tables for escape_strings and no_line_breaks
+ESCAPE_TABLE = {ord("\r"): "\\r", ord("\n"): "\\n", ord("\t"): "\\t"}
+LINE_BREAK_TABLE = {ord("\r"): " ", ord("\n"): " ", ord("\t"): " "}
+
+ROW_BATCH_SIZE = 1024  # rows handed to csv writer.writerows at once
+PARSE_CHUNK_SIZE = 1 << 16  # bytes fed to the parser at a time when rows are iterated
+COLUMN_BATCH_ROWS = 1 << 16  # rows per batch of Xlsx2csv.read_columns
+TRAILING_READ_SIZE = 1 << 20  # bytes decompressed at a time while looking for the elements after sheetData
+TRAILING_ELEMENTS = ("mergeCells", "hyperlinks")  # elements after sheetData read before the sheet is parsed
+
 DEFAULT_APP_PATH = "/xl"
 DEFAULT_WORKBOOK_PATH = DEFAULT_APP_PATH + "/workbook.xml"
 
@@ -169,6 +178,649 @@ class XlsxValueError(XlsxException):
     pass
 
 
+class StopSheet(Exception):
+    """Raised by the Sheet handlers to stop parsing once the last wanted row is written"""
+
+
+COLUMN_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+MAX_COLUMNS = 16384  # A..XFD
+_column_index = {}  # type: Dict[str, int]
+
+
+class MetadataCache:
+    """
+     On-disk cache of parsed workbook metadata (content types, shared strings, styles, workbook and
+     its relationships), one pickle per workbook keyed by the name, CRC and size of every zip member.
+     Entries hold plain dicts, lists and tuples only, so that they load whatever module name
+     xlsx2csv was imported under (the command line runs it as __main__).
+     Entries are evicted least recently used first once the directory grows past max_size bytes.
+     Only point it at a directory you trust, entries are unpickled.
+    """
+    VERSION = 2  # bump when the cached fields change shape
+
+    def __init__(self, directory, max_size):
+        # type: (str, int) -> None
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, ziphandle):
+        # type: (zipfile.ZipFile) -> str
+        import hashlib
+        digest = hashlib.sha256(("%s/%d" % (__version__, self.VERSION)).encode())
+        for info in sorted(ziphandle.infolist(), key=lambda i: i.filename):
+            digest.update(("%s\0%d\0%d\n" % (info.filename, info.CRC, info.file_size)).encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pickle")
+
+    def load(self, key):
+        # type: (str) -> Optional[Dict[str, Any]]
+        import pickle
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            # missing, truncated or unreadable entry: parse again and overwrite it
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key, entry):
+        # type: (str, Dict[str, Any]) -> None
+        """Writes entry atomically, a cache that can't be written is silently skipped"""
+        import pickle, tempfile
+        tmp = None
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, tmp = tempfile.mkstemp(prefix=key, suffix=".tmp", dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+            tmp = None
+            self.evict()
+        except (IOError, OSError):
+            pass
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pickle"):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_size:
+                break
+            os.unlink(os.path.join(self.directory, name))
+            total -= size
+
+
+class ElementHandlers(dict):
+    """
+     Maps element names as reported by expat, prefixed ("x:c") or not ("c"), to the handler
+     registered for their local name, None for elements without a handler. Every distinct name is
+     resolved once, after that dispatching an element event is a single dict lookup.
+    """
+
+    def __init__(self, handlers):
+        # type: (Dict[str, Any]) -> None
+        dict.__init__(self)
+        self.handlers = handlers
+
+    def __missing__(self, name):
+        # "x:c" from expat, "{namespace}c" from lxml
+        handler = self.handlers.get(name[max(name.rfind(":"), name.rfind("}")) + 1:])
+        self[name] = handler
+        return handler
+
+
+class ExpatParser:
+    """
+     Default parser backend, feeds the target's handleStartElement / handleEndElement /
+     handleCharData callbacks straight from expat.
+    """
+    name = "expat"
+
+    def _create(self, target):
+        parser = xml.parsers.expat.ParserCreate()
+        parser.buffer_text = True
+        parser.CharacterDataHandler = target.handleCharData
+        parser.StartElementHandler = target.handleStartElement
+        parser.EndElementHandler = target.handleEndElement
+        return parser
+
+    def parse(self, target, source):
+        # type: (Any, Union[IO[bytes], bytes, str]) -> None
+        parser = self._create(target)
+        if isinstance(source, (bytes, str)):
+            parser.Parse(source, True)
+        else:
+            parser.ParseFile(source)
+
+    def iterparse(self, target, source, chunk_size=PARSE_CHUNK_SIZE):
+        # type: (Any, Union[IO[bytes], bytes, str], int) -> Iterator[None]
+        """Like parse, but feeds source to expat chunk_size bytes at a time and yields after each chunk"""
+        parser = self._create(target)
+        if isinstance(source, (bytes, str)):
+            parser.Parse(source, True)
+            yield
+            return
+        while True:
+            chunk = source.read(chunk_size)
+            parser.Parse(chunk, not chunk)
+            yield
+            if not chunk:
+                return
+
+
+class LxmlParser:
+    """
+     Parser backend on top of lxml.etree.iterparse, drives the same callbacks as ExpatParser.
+     Processed elements are cleared and detached from the tree, so memory stays flat however
+     large the part is.
+    """
+    name = "lxml"
+    EVENTS_PER_YIELD = 4096  # events handled between two yields of iterparse
+
+    def __init__(self):
+        try:
+            from lxml import etree
+        except ImportError:
+            raise XlsxException("lxml parser requested but lxml is not installed")
+        self.etree = etree
+
+    def parse(self, target, source):
+        # type: (Any, Union[IO[bytes], bytes, str]) -> None
+        for _ in self.iterparse(target, source):
+            pass
+
+    def iterparse(self, target, source):
+        # type: (Any, Union[IO[bytes], bytes, str]) -> Iterator[None]
+        """Like parse, but yields every EVENTS_PER_YIELD events"""
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        handleStartElement = target.handleStartElement
+        handleEndElement = target.handleEndElement
+        handleCharData = target.handleCharData
+
+        # iterparse only knows an element's text once its first child starts or the element ends,
+        # and its tail once the next event arrives, so character data is handed over lagging one
+        # event behind, which is still before any callback it could affect
+        open_text = None  # element whose text has not been delivered yet
+        last_ended = None  # element whose tail has not been delivered yet
+        events = 0
+        for event, elem in self.etree.iterparse(source, events=("start", "end"), resolve_entities=False):
+            events += 1
+            if events == self.EVENTS_PER_YIELD:
+                events = 0
+                yield
+            if open_text is not None:
+                if open_text.text:
+                    handleCharData(open_text.text)
+                open_text = None
+            if last_ended is not None:
+                if last_ended.tail:
+                    handleCharData(last_ended.tail)
+                last_ended.clear()
+                parent = last_ended.getparent()
+                if parent is not None:
+                    del parent[0]
+                last_ended = None
+            if event == "start":
+                handleStartElement(elem.tag, elem.attrib)
+                open_text = elem
+            else:
+                handleEndElement(elem.tag)
+                last_ended = elem
+        yield
+
+
+PARSERS = {
+    ExpatParser.name: ExpatParser,
+    LxmlParser.name: LxmlParser,
+}
+
+
+def split_ns_name(name):
+    # type: (str) -> Any
+    """Splits a name from a namespace processing expat parser into (uri, local name, qualified name)"""
+    parts = name.split(" ")
+    if len(parts) == 1:
+        return None, name, name
+    if len(parts) == 2:
+        return parts[0], parts[1], parts[1]
+    return parts[0], parts[1], parts[2] + ":" + parts[1]
+
+
+def parse_namespaced(filehandle, start, end=None):
+    """
+     Streams a small metadata part through expat with namespace processing. Calls
+     start(uri, local, qname, attrs, depth) and end(uri, local, qname, depth) per element, the root
+     being at depth 0; attrs are keyed by qualified name like minidom's.
+    """
+    parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+    parser.namespace_prefixes = True
+    depth = [0]
+
+    def handleStartElement(name, attrs):
+        if attrs:
+            attrs = dict((split_ns_name(k)[2], v) for k, v in attrs.items())
+        start(*split_ns_name(name) + (attrs, depth[0]))
+        depth[0] += 1
+
+    def handleEndElement(name):
+        depth[0] -= 1
+        if end is not None:
+            end(*split_ns_name(name) + (depth[0],))
+
+    parser.StartElementHandler = handleStartElement
+    parser.EndElementHandler = handleEndElement
+    parser.ParseFile(filehandle)
+
+
+def ns_matcher(root_uri, name):
+    """
+     Element test equivalent to minidom's root.getElementsByTagNameNS(root_uri, name) when the root
+     element has a namespace and root.getElementsByTagName(name) when it has none.
+    """
+    if root_uri:
+        return lambda uri, local, qname: local == name and uri == root_uri
+    return lambda uri, local, qname: qname == name
+
+
+def find_trailing_elements(filehandle, names, chunk_size=TRAILING_READ_SIZE):
+    # type: (IO[bytes], tuple, int) -> Dict[str, bytes]
+    """
+     Reads a sheet part forward once and returns the bytes of every element in names that follows
+     sheetData ("mergeCells", "hyperlinks"), prefixed or not, by name; elements the part doesn't have
+     are left out. At most one chunk of the sheet data is held in memory at a time.
+    """
+    tags = b"|".join(re.escape(name.encode("ascii")) for name in names)
+    start_re = re.compile(br"<((?:[A-Za-z_][\w.-]*:)?)(" + tags + br")[\s/>]")
+    overlap = max(len(name) for name in names) + 64
+    found = {}  # type: Dict[str, bytes]
+    data = bytearray()
+    pos = 0
+    eof = False
+    while len(found) < len(names):
+        match = start_re.search(data, pos)
+        if match is None:
+            if eof:
+                break
+            # only the tail a start tag may begin in is kept
+            del data[:max(pos, len(data) - overlap)]
+            pos = 0
+            chunk = filehandle.read(chunk_size)
+            eof = not chunk
+            data += chunk
+            continue
+
+        end_tag = b"</" + match.group(1) + match.group(2) + b">"
+        end = data.find(end_tag, match.end())
+        while end < 0 and not eof:
+            chunk = filehandle.read(chunk_size)
+            eof = not chunk
+            start = max(match.end(), len(data) - len(end_tag))
+            data += chunk
+            end = data.find(end_tag, start)
+        if end < 0:
+            # empty element or truncated part
+            pos = match.end()
+            continue
+        found.setdefault(match.group(2).decode("ascii"), bytes(data[match.start():end + len(end_tag)]))
+        pos = end + len(end_tag)
+    return found
+
+
+def get_parser(name):
+    # type: (Optional[str]) -> Any
+    """Returns a parser backend instance, "expat" when name is None"""
+    if not name:
+        return ExpatParser()
+    if name not in PARSERS:
+        raise XlsxValueError("Unknown parser '%s', expected one of: %s" % (name, ", ".join(sorted(PARSERS))))
+    return PARSERS[name]()
+
+
+def column_index(col):
+    # type: (str) -> int
+    """Zero based index of a column reference, "A" -> 0, "XFD" -> 16383, "" -> -1"""
+    if not _column_index:
+        names = list(COLUMN_LETTERS)
+        names += [a + b for a in COLUMN_LETTERS for b in COLUMN_LETTERS]
+        names += [a + b for a in COLUMN_LETTERS for b in names[26:26 + 26 * 26]]
+        _column_index.update((name, i) for i, name in enumerate(names[:MAX_COLUMNS]))
+    index = _column_index.get(col)
+    if index is None:
+        # outside of the excel range, or not upper case
+        t = 0
+        for i in col: t = t * 26 + ord(i) - 64
+        index = t - 1
+    return index
+
+
+def parse_rows(spec):
+    # type: (str) -> tuple
+    """First and last row number of a row range, "5:10" -> (5, 10), "5:" -> (5, None), ":10" -> (1, 10), "7" -> (7, 7)"""
+    first, colon, last = spec.strip().partition(":")
+    try:
+        first = int(first) if first else 1
+        last = int(last) if last else (None if colon else first)
+    except ValueError:
+        raise XlsxValueError("Invalid row range '%s'" % spec)
+    if first < 1 or (last is not None and last < first):
+        raise XlsxValueError("Invalid row range '%s'" % spec)
+    return first, last
+
+
+def parse_column(ref):
+    # type: (str) -> int
+    """Zero based index of a column name, "A" -> 0, "xfd" -> 16383, XlsxValueError for anything past XFD"""
+    name = ref.strip().upper()
+    index = column_index(name) if re.match(r"^[A-Z]{1,3}$", name) else MAX_COLUMNS
+    if index >= MAX_COLUMNS:
+        raise XlsxValueError("Invalid column '%s', columns go from A to XFD" % ref.strip())
+    return index
+
+
+def parse_condition(spec):
+    # type: (str) -> tuple
+    """
+     Column index and test of a row condition like "D=KR", "E>=100" or "F!='n/a'", see Sheet.set_row_filter.
+     An unquoted number compares as a number and cells that aren't numbers (text, empty) never match it;
+     anything else, quoted numbers included, compares as text.
+    """
+    match = CONDITION_RE.match(spec)
+    if not match:
+        raise XlsxValueError("Invalid condition '%s'" % spec)
+    column, operator, value = match.groups()
+    compare = COMPARISONS[operator]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        text = value[1:-1]
+        return parse_column(column), lambda raw: compare(raw, text)
+    if not NUMBER_VALUE_RE.match(value):
+        return parse_column(column), lambda raw: compare(raw, value)
+    number = float(value)
+
+    def test(raw):
+        return NUMBER_VALUE_RE.match(raw) is not None and compare(float(raw), number)
+    return parse_column(column), test
+
+
+def parse_columns(spec):
+    # type: (str) -> List[int]
+    """
+     Zero based indexes of the columns of a column list, "A,C,F:H" -> [0, 2, 5, 6, 7]. Columns past XFD,
+     reversed ranges and columns listed more than once are rejected with XlsxValueError.
+    """
+    columns = []
+    for part in spec.split(","):
+        first, colon, last = part.partition(":")
+        first = parse_column(first)
+        last = parse_column(last) if colon else first
+        if last < first:
+            raise XlsxValueError("Invalid column list '%s'" % spec)
+        columns.extend(range(first, last + 1))
+    if len(set(columns)) < len(columns):
+        raise XlsxValueError("Invalid column list '%s', a column is listed more than once" % spec)
+    return columns
+
+
+def split_cell_ref(ref):
+    # type: (str) -> tuple
+    """Split a cell reference into column letters, zero based column index and row, "B12" -> ("B", 1, "12")"""
+    col = ref.rstrip("0123456789")
+    return col, column_index(col), ref[len(col):]
+
+
+def split_range_ref(ref):
+    # type: (str) -> Optional[tuple]
+    """Split a range reference into (top row, bottom row, left column, right column), "B2:D5" -> (2, 5, 1, 3)"""
+    rng = ref.split(":")
+    if len(rng) != 2:
+        return None
+    start = re.match(r"^([A-Z]+)(\d+)$", rng[0])
+    end = re.match(r"^([A-Z]+)(\d+)$", rng[1])
+    if not start or not end:
+        return None
+    return int(start.group(2)), int(end.group(2)), column_index(start.group(1)), column_index(end.group(1))
+
+
+class RangeIndex:
+    """
+     Cell ranges of a sheet as (top, bottom, left, right, ...) tuples sorted by top row. advance(row)
+     keeps in active the ranges covering row, sorted by left column; rows must be visited in
+     ascending order.
+    """
+
+    def __init__(self, ranges=()):
+        self.ranges = sorted(ranges)
+        self.next = 0  # first range not yet active
+        self.active = []
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def advance(self, row):
+        # type: (int) -> bool
+        """Activates the ranges starting at or above row and retires those ending above it, True on change"""
+        active = [rng for rng in self.active if rng[1] >= row]
+        changed = len(active) != len(self.active)
+        ranges = self.ranges
+        while self.next < len(ranges) and ranges[self.next][0] <= row:
+            if ranges[self.next][1] >= row:
+                active.append(ranges[self.next])
+                changed = True
+            self.next += 1
+        if changed:
+            active.sort(key=lambda rng: rng[2])
+            self.active = active
+        return changed
+
+
+def classify_format(format_str):
+    # type: (Optional[str]) -> Optional[str]
+    """Static part of the cell format classification, see Styles.compile"""
+    if not format_str:
+        return None
+    if format_str in FORMATS:
+        return FORMATS[format_str]
+    if DATE_FORMAT_RE.match(format_str) and not ELAPSED_FORMAT_RE.match(format_str):
+        return "datetime"
+    return None
+
+
+def date_format_to_strftime(format_str):
+    # type: (str) -> str
+    """Translate an excel date/time format code to a strftime pattern"""
+    # ignore ";@", don't know what does it mean right now
+    # ignore "[$-409], [$-f409], [$-16001]" and similar format codes
+    return re.sub(r"\[\$\-[A-z0-9]*\]", "", format_str, count=1) \
+        .replace(";@", "").replace("yyyy", "%Y").replace("yy", "%y") \
+        .replace("hh:mm", "%H:%M").replace("h", "%I").replace("%H%H", "%H") \
+        .replace("ss", "%S").replace("dddd", "d").replace("dd", "d").replace("d", "%d") \
+        .replace("am/pm", "%p").replace("mmmm", "%B").replace("mmm", "%b") \
+        .replace(":mm", ":%M").replace("m", "%m").replace("%m%m", "%m")
+
+
+def number_value(data):
+    # type: (str) -> Union[int, float]
+    """Convert the text of a numeric cell to int, or float if it has a fraction or an exponent"""
+    if "." in data or "e" in data or "E" in data:
+        return float(data)
+    return int(data)
+
+
+class ColumnBuffer:
+    """
+     Copies the typed rows of a sheet into a preallocated 2-D object array as they are parsed, and
+     turns every batch of rows into numpy masked arrays, one per column with empty cells masked, see
+     Xlsx2csv.read_columns. The dtype of a column is fixed by the first batch it has values in:
+     float64 for numbers, datetime64[us] for dates, bool for booleans and object for anything else or
+     a mix; columns without values so far are float64. Values in later batches of another type than
+     the dtype of their column holds (text, booleans in a number column, numbers in a date column) are
+     masked, never converted, so a column keeps its dtype from batch to batch.
+    """
+
+    def __init__(self, numpy, rows):
+        # type: (Any, int) -> None
+        self.numpy = numpy
+        self.rows = rows
+        self.count = 0
+        self.block = numpy.full((rows, 0), "", dtype=object)
+        self.dtypes = []  # type: List[Any]
+        self.kinds = {
+            numpy.dtype(numpy.float64): (int, float),
+            numpy.dtype("datetime64[us]"): (datetime.datetime,),
+            numpy.dtype(bool): (bool,),
+        }
+        self.fills = {
+            numpy.dtype(numpy.float64): float("nan"),
+            numpy.dtype("datetime64[us]"): numpy.datetime64("NaT"),
+            numpy.dtype(bool): False,
+        }
+
+    def append(self, row):
+        # type: (List[Any]) -> bool
+        """Adds a row to the batch, True once it is full"""
+        width = len(row)
+        if width > self.block.shape[1]:
+            block = self.numpy.full((self.rows, width), "", dtype=object)
+            block[:, :self.block.shape[1]] = self.block
+            self.block = block
+            self.dtypes.extend([None] * (width - len(self.dtypes)))
+        if width:
+            self.block[self.count, :width] = row
+        self.count += 1
+        return self.count >= self.rows
+
+    def flush(self):
+        # type: () -> List[Any]
+        """Masked arrays of the rows added since the last flush, which starts the next batch"""
+        numpy = self.numpy
+        count, self.count = self.count, 0
+        columns = []
+        for i in range(self.block.shape[1]):
+            values = self.block[:count, i]
+            mask = values == ""
+            if self.dtypes[i] is None and not mask.all():
+                self.dtypes[i] = self._dtype(values[~mask])
+            columns.append(self._array(values, mask, self.dtypes[i] or numpy.dtype(numpy.float64)))
+            values[:] = ""
+        return columns
+
+    def _dtype(self, values):
+        numpy = self.numpy
+        kinds = set(map(type, values))
+        if kinds <= {int, float}:
+            return numpy.dtype(numpy.float64)
+        if kinds == {datetime.datetime}:
+            return numpy.dtype("datetime64[us]")
+        if kinds == {bool}:
+            return numpy.dtype(bool)
+        return numpy.dtype(object)
+
+    def _array(self, values, mask, dtype):
+        numpy = self.numpy
+        data = values.copy()
+        if dtype == object:
+            data[mask] = None
+            return numpy.ma.MaskedArray(data, mask=mask)
+        # values of another type are masked before astype could convert them, like "123" or True to a
+        # float or 5 to a date; bool is not among the kinds of a number column even though it is an int
+        kinds = self.kinds[dtype]
+        fits = numpy.fromiter((type(value) in kinds for value in data), dtype=bool, count=len(data))
+        mask |= ~fits
+        data[mask] = self.fills[dtype]
+        return numpy.ma.MaskedArray(data.astype(dtype), mask=mask)
+
+
+def split_decimal(data):
+    # type: (str) -> Optional[tuple]
+    """Split plain decimal text like "-12.50" into ("-", "12", "50"), None if it is anything else"""
+    if data[:1] == "-":
+        sign, body = "-", data[1:]
+    else:
+        sign, body = "", data
+    whole, dot, frac = body.partition(".")
+    if not (whole.isdigit() and whole.isascii()):
+        return None
+    if dot and not (frac.isdigit() and frac.isascii()):
+        return None
+    return sign, whole, frac
+
+
+class FloatFormat:
+    """
+     Renders the text of a numeric cell for one number format.
+
+     Plain integer and decimal text is rendered straight from its digits when the result is
+     guaranteed to be the same as going through float(): integers up to 15 digits, and decimals
+     with up to 9 integer digits and no more fraction digits than the format prints. Everything
+     else (exponents, long numbers, floatformat) takes the float/Decimal path.
+    """
+
+    def __init__(self, format_str, floatformat=None):
+        # type: (str, Optional[str]) -> None
+        self.format_str = format_str
+        self.floatformat = floatformat
+        self.decimals = None  # type: Optional[int]
+        if format_str[0:3] == '0.0':
+            self.decimals = len(format_str.split(".")[1])
+            if '%' in format_str:
+                self.decimals += 1
+
+    def format(self, data):
+        # type: (str) -> str
+        if not self.floatformat:
+            parts = split_decimal(data)
+            if parts is not None:
+                sign, whole, frac = parts
+                whole = whole.lstrip("0")
+                frac = frac.rstrip("0")
+                if not frac:
+                    if len(whole) <= 15:
+                        return sign + whole if whole else "0"
+                elif len(whole) <= 9:
+                    if self.decimals is None:
+                        if len(frac) <= 6:
+                            return sign + (whole or "0") + "." + frac
+                    elif len(frac) <= self.decimals <= 6:
+                        return sign + (whole or "0") + "." + frac.ljust(self.decimals, "0")
+        return self.format_float(data)
+
+    def format_float(self, data):
+        # type: (str) -> str
+        value = float(data)
+        if not self.floatformat and value.is_integer():
+            from decimal import Decimal
+            # repr(float(...)) - workaround to correctly round precision for floats
+            return "%i" % Decimal(repr(value))
+        elif ('E' in data or 'e' in data) or self.floatformat:
+            return str(self.floatformat or '%f') % value
+        # if cell is general, be aggressive about stripping any trailing 0s, decimal points, etc.
+        elif self.format_str == 'general':
+            return ("%f" % value).rstrip('0').rstrip('.')
+        elif self.decimals is not None:
+            return ("%." + str(self.decimals) + "f") % value
+        # unsupported float formatting
+        return ("%f" % value).rstrip('0').rstrip('.')
+
+
 class Xlsx2csv:
     """
      Usage:
@@ -195,6 +847,30 @@ class Xlsx2csv:
        exclude_sheet_pattern - exclude sheets named matching given pattern
        exclude_hidden_sheets - exclude hidden sheets
        skip_hidden_rows - skip hidden rows
+       date_cache_size - number of rendered date/time values to memoize per sheet (0 to disable)
+       output_buffer_size - buffer size in bytes for output files opened by path (None for the default)
+       parser - xml parser backend for shared strings and sheets: "expat" (default) or "lxml"
+       compact_shared_strings - keep shared strings in a compact UTF-8 buffer instead of a list of str
+       shared_strings_cache_size - number of decoded shared strings cached by the compact store (0 to disable)
+       mmap_shared_strings - stream shared strings into a temporary on-disk index served through mmap
+       shared_strings_index - path of an index built by another instance with mmap_shared_strings to map
+           read-only instead of parsing shared strings again (see shared_strings.strings.path)
+       shared_strings - already parsed SharedStrings, escaped or with line breaks replaced if asked to, to use
+           instead of parsing them
+       styles - already parsed Styles to use instead of parsing them
+       metadata_cache - directory of an on-disk cache of parsed workbook metadata (None to disable), later
+           opens of an unchanged workbook load it instead of parsing; not used with mmap-ed shared strings
+       metadata_cache_size - maximum size of the metadata cache directory in bytes
+       selective_shared_strings - if shared strings are not loaded yet, scan each converted sheet for the
+           shared strings it references and load only those
+       rows - convert only the rows numbered START to END of a range "START:END", either end may be left out
+       head - convert at most this many rows, counting the empty lines written for missing rows
+       where - convert only the rows meeting all of these conditions, strings like "D=KR" or "E>=100" or
+           (column index, function of the raw value) pairs, see Sheet.set_row_filter
+       columns - convert only these columns, in this order, as a list of columns and column ranges like "A,C,F:H"
+       column_names - convert only the columns with these names in the first row, after those in columns
+       typed_values - leave numbers, dates, times and booleans unformatted as int or float, datetime.datetime,
+           datetime.time and bool instead of rendering them as text, see Sheet.set_typed_values
     """
 
     def __init__(self, xlsxfile, **options):
@@ -220,20 +896,43 @@ class Xlsx2csv:
         options.setdefault("outputencoding", "utf-8")
         options.setdefault("skip_hidden_rows", True)
         options.setdefault("ignore_invalid_char_data", False)
+        options.setdefault("date_cache_size", 4096)
+        options.setdefault("output_buffer_size", None)
+        options.setdefault("parser", "expat")
+        options.setdefault("compact_shared_strings", False)
+        options.setdefault("shared_strings_cache_size", 1024)
+        options.setdefault("mmap_shared_strings", False)
+        options.setdefault("shared_strings_index", None)
+        options.setdefault("shared_strings", None)
+        options.setdefault("styles", None)
+        options.setdefault("metadata_cache", None)
+        options.setdefault("metadata_cache_size", 256 * 1024 * 1024)
+        options.setdefault("selective_shared_strings", False)
+        options.setdefault("typed_values", False)
+        options.setdefault("rows", None)
+        options.setdefault("head", None)
+        options.setdefault("where", None)
+        options.setdefault("columns", None)
+        options.setdefault("column_names", None)
 
         self.options = options
-        self.py3 = sys.version_info[0] == 3
         self.ziphandle = None
+        self._shared_strings = None  # type: Optional[SharedStrings]
+        self._styles = None  # type: Optional[Styles]
+        self.columns = parse_columns(options["columns"]) if options["columns"] else []
+        self.rows = parse_rows(options["rows"]) if options["rows"] else (1, None)
+        self.conditions = [parse_condition(condition) if isinstance(condition, str) else condition
+                           for condition in options["where"] or []]
+        if options["head"] is not None and options["head"] < 0:
+            raise XlsxValueError("Invalid head %d" % options["head"])
 
         xlsxinputfile = None
-        if xlsxfile == "-" and self.py3:
+        if xlsxfile == "-":
             xlsxfile = "STDIN"
             if sys.stdin.buffer.seekable():
                 xlsxinputfile = sys.stdin.buffer
             else:
                 xlsxinputfile = io.BytesIO(sys.stdin.buffer.read())
-        elif xlsxfile == "-" and not self.py3:
-            raise ValueError("The - notation for STDIN is not supported for python2")
         else:
             xlsxinputfile = xlsxfile
 
@@ -241,19 +940,75 @@ class Xlsx2csv:
             self.ziphandle = zipfile.ZipFile(xlsxinputfile)
         except (zipfile.BadZipfile, IOError):
             raise InvalidXlsxFileException("Invalid xlsx file: " + str(xlsxfile))
-
-
-        self.content_types = self._parse(ContentTypes, "/[Content_Types].xml")
-        self.shared_strings = self._parse(SharedStrings, self.content_types.types["shared_strings"])
-        self.styles = self._parse(Styles, self.content_types.types["styles"])
-        self.workbook = self._parse(Workbook, self.content_types.types["workbook"])
-        workbook_relationships = list(filter(lambda r: "book" in r, self.content_types.types["relationships"]))
-        if len(workbook_relationships) > 0:
-            self.workbook.relationships = self._parse(Relationships, workbook_relationships[0])
-        else:
+        # lower-cased member name -> member name, the first one wins like a scan of namelist() would
+        self.members = {}  # type: Dict[str, str]
+        for name in self.ziphandle.namelist():
+            self.members.setdefault(name.lower(), name)
+
+
+        cache = None
+        cached = None
+        if self.options['metadata_cache'] and not self.options['mmap_shared_strings'] and \
+                not self.options['shared_strings_index'] and self.options['shared_strings'] is None:
+            cache = MetadataCache(self.options['metadata_cache'], self.options['metadata_cache_size'])
+            cache_key = cache.key(self.ziphandle)
+            cached = cache.load(cache_key)
+        if cached is not None:
+            self.content_types = ContentTypes()
+            self.content_types.types = cached['content_types']
+            strings = cached['shared_strings']
+            if self.options['compact_shared_strings']:
+                strings = CompactStrings(self.options['shared_strings_cache_size'])
+                for value in cached['shared_strings']:
+                    strings.append(value)
+            self._shared_strings = SharedStrings(strings=strings)
+            if self.options['styles'] is not None:
+                self._styles = self.options['styles']
+            else:
+                self._styles = Styles()
+                self._styles.numFmts, self._styles.cellXfs, self._styles.cellFormats = cached['styles']
+            self.workbook = Workbook()
+            self.workbook.sheets, self.workbook.date1904, self.workbook.appName, relationships = cached['workbook']
             self.workbook.relationships = Relationships()
-        if self.options['escape_strings']:
-            self.shared_strings.escape_strings()
+            self.workbook.relationships.relationships = relationships
+        else:
+            self._parse_metadata()
+            if cache is not None:
+                # everything is loaded up front so that it can be cached, escaping is applied after
+                self._shared_strings = self._parse_shared_strings(escape=False)
+                # the cache holds the styles of the file, not the ones passed in by the caller
+                if self.options['styles'] is not None:
+                    styles = self._parse(Styles, self.content_types.types["styles"])
+                else:
+                    styles = self.styles
+                cache.store(cache_key, {
+                    'content_types': self.content_types.types,
+                    'shared_strings': list(self._shared_strings.strings),
+                    'styles': (styles.numFmts, styles.cellXfs, styles.cellFormats),
+                    'workbook': (self.workbook.sheets, self.workbook.date1904, self.workbook.appName,
+                                 self.workbook.relationships.relationships),
+                })
+        if self._shared_strings is not None:
+            self._prepare_shared_strings(self._shared_strings)
+
+    @property
+    def shared_strings(self):
+        # type: () -> SharedStrings
+        """Shared strings, parsed on first access"""
+        if self._shared_strings is None:
+            self._shared_strings = self._parse_shared_strings()
+        return self._shared_strings
+
+    @property
+    def styles(self):
+        # type: () -> Styles
+        """Styles, parsed on first access"""
+        if self._styles is None:
+            if self.options['styles'] is not None:
+                self._styles = self.options['styles']
+            else:
+                self._styles = self._parse(Styles, self.content_types.types["styles"])
+        return self._styles
 
     def __enter__(self):
         # type: () -> Xlsx2csv
@@ -269,10 +1024,12 @@ class Xlsx2csv:
 
     def close(self):
         # type: () -> None
-        """Explicitly close the underlying zip file handle."""
+        """Explicitly close the underlying zip file handle and shared strings index."""
         if self.ziphandle:
             self.ziphandle.close()
             self.ziphandle = None
+        if self._shared_strings is not None and self._shared_strings is not self.options['shared_strings']:
+            self._shared_strings.close()
 
     def getSheetIdByName(self, name):
         # type: (str) -> Optional[int]
@@ -291,6 +1048,7 @@ class Xlsx2csv:
         if sheetid > 0:
             self._convert(sheetid, outfile)
         else:
+            closefile = False
             if isinstance(outfile, str):
                 if not os.path.exists(outfile):
                     os.makedirs(outfile)
@@ -299,144 +1057,278 @@ class Xlsx2csv:
             elif hasattr(outfile, "open"):
                 if outfile.exists():
                     raise OutFileAlreadyExistsException("File " + str(outfile) + " already exists!")
-                outfile = outfile.open("w+", encoding=self.options['outputencoding'], newline="")
+                outfile = outfile.open("w+", buffering=self.options['output_buffer_size'] or -1,
+                                       encoding=self.options['outputencoding'], newline="")
+                closefile = True
+            try:
+                self._convert_sheets(outfile)
+            finally:
+                if closefile:
+                    outfile.close()
 
-            for s in self.workbook.sheets:
-                sheetname = s['name']
-                sheetstate = s['state']
+    def _convert_sheets(self, outfile):
+        # type: (Union[str, TextIO]) -> None
+        """Converts every sheet kept by the sheet filters, into outfile or a file per sheet when outfile is a directory"""
+        for s in self.workbook.sheets:
+            sheetname = s['name']
+            sheetstate = s['state']
 
-                # filter hidden sheets
-                if sheetstate in ('hidden', 'veryHidden') and self.options['exclude_hidden_sheets']:
-                    continue
+            # filter hidden sheets
+            if sheetstate in ('hidden', 'veryHidden') and self.options['exclude_hidden_sheets']:
+                continue
 
-                # filter sheets by include pattern
-                include_sheet_pattern = self.options['include_sheet_pattern']
-                if type(include_sheet_pattern) == type(""):  # optparser lib fix
-                    include_sheet_pattern = [include_sheet_pattern]
-                if len(include_sheet_pattern) > 0:
-                    include = False
-                    for pattern in include_sheet_pattern:
-                        include = pattern and len(pattern) > 0 and re.match(pattern, sheetname)
-                        if include:
-                            break
-                    if not include:
-                        continue
-
-                # filter sheets by exclude pattern
-                exclude_sheet_pattern = self.options['exclude_sheet_pattern']
-                if type(exclude_sheet_pattern) == type(""):  # optparser lib fix
-                    exclude_sheet_pattern = [exclude_sheet_pattern]
-                exclude = False
-                for pattern in exclude_sheet_pattern:
-                    exclude = pattern and len(pattern) > 0 and re.match(pattern, sheetname)
-                    if exclude:
+            # filter sheets by include pattern
+            include_sheet_pattern = self.options['include_sheet_pattern']
+            if type(include_sheet_pattern) == type(""):  # a single pattern
+                include_sheet_pattern = [include_sheet_pattern]
+            if len(include_sheet_pattern) > 0:
+                include = False
+                for pattern in include_sheet_pattern:
+                    include = pattern and len(pattern) > 0 and re.match(pattern, sheetname)
+                    if include:
                         break
-                if exclude:
+                if not include:
                     continue
 
-                if not self.py3:
-                    sheetname = sheetname.encode('utf-8')
-                of = outfile
-                if isinstance(outfile, str):
-                    of = os.path.join(outfile, sheetname + '.csv')
-                elif self.options['sheetdelimiter'] and len(self.options['sheetdelimiter']):
-                    of.write(self.options['sheetdelimiter'] + " " + str(s['index']) + " - " + sheetname + self.options['lineterminator'])
-                self._convert(s['index'], of)
+            # filter sheets by exclude pattern
+            exclude_sheet_pattern = self.options['exclude_sheet_pattern']
+            if type(exclude_sheet_pattern) == type(""):  # a single pattern
+                exclude_sheet_pattern = [exclude_sheet_pattern]
+            exclude = False
+            for pattern in exclude_sheet_pattern:
+                exclude = pattern and len(pattern) > 0 and re.match(pattern, sheetname)
+                if exclude:
+                    break
+            if exclude:
+                continue
+
+            of = outfile
+            if isinstance(outfile, str):
+                of = os.path.join(outfile, sheetname + '.csv')
+            elif self.options['sheetdelimiter'] and len(self.options['sheetdelimiter']):
+                of.write(self.options['sheetdelimiter'] + " " + str(s['index']) + " - " + sheetname + self.options['lineterminator'])
+            self._convert(s['index'], of)
+
+    def iter_rows(self, sheetid=1, sheetname=None):
+        # type: (int, Optional[str]) -> Iterator[List[str]]
+        """
+         Yields the rows of a sheet as lists of str, the rows convert would write with the same options,
+         without going through csv. The sheet is parsed incrementally as rows are consumed.
+        """
+        for batch in self.iter_row_batches(sheetid, sheetname):
+            for row in batch:
+                yield row
+
+    def iter_row_batches(self, sheetid=1, sheetname=None, batch_size=ROW_BATCH_SIZE):
+        # type: (int, Optional[str], int) -> Iterator[List[List[str]]]
+        """Like iter_rows, but yields the rows in lists of batch_size rows, the last one possibly shorter"""
+        return self._iter_row_batches(sheetid, sheetname, batch_size, self.options['typed_values'])
+
+    def read_columns(self, sheetid=1, sheetname=None, batch_rows=COLUMN_BATCH_ROWS, header=False):
+        # type: (int, Optional[str], int, bool) -> Iterator[List[Any]]
+        """
+         Yields the cells of a sheet column by column, batch_rows rows at a time, as lists of numpy masked
+         arrays, one per column with empty cells masked. Values are typed as with typed_values and copied
+         into preallocated arrays as the sheet is parsed; a column keeps the dtype the first batch it has
+         values in gives it, see ColumnBuffer. With header the first row, the column names, is left out
+         (next(iter_rows()) reads it). A batch has at least as many columns as the batches before it.
+         Needs numpy.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise XlsxException("read_columns needs numpy, which is not installed")
+        buffer = ColumnBuffer(numpy, batch_rows)
+        skip = 1 if header else 0
+        for rows in self._iter_row_batches(sheetid, sheetname, ROW_BATCH_SIZE, True):
+            for row in rows:
+                if skip:
+                    skip -= 1
+                elif buffer.append(row):
+                    yield buffer.flush()
+        if buffer.count:
+            yield buffer.flush()
+
+    def _iter_row_batches(self, sheetid, sheetname, batch_size, typed_values):
+        if sheetname:
+            sheetid = self.getSheetIdByName(sheetname)
+            if not sheetid:
+                raise XlsxException("Sheet '%s' not found" % sheetname)
+        sheet = self._open_sheet(sheetid)
+        sheet.set_typed_values(typed_values)
+        try:
+            for batch in sheet.iter_row_batches(batch_size):
+                yield batch
+        finally:
+            sheet.filehandle.close()
+            sheet.close()
+
+    def _open_sheet(self, sheet_index):
+        # type: (int) -> Sheet
+        """Opens the sheet at sheet_index set up with the conversion options, the caller closes its filehandle"""
+        sheet_path = self.get_sheet_path(sheet_index)
+        sheet_file = self.open_part(sheet_path)
+        if sheet_file is None:
+            raise SheetNotFoundException("Sheet %i not found" % sheet_index)
+        try:
+            if self.options['selective_shared_strings'] and self._shared_strings is None and \
+                    self.options['shared_strings'] is None and not self.options['shared_strings_index']:
+                shared_strings = self._parse_selected_strings(sheet_path)
+            else:
+                shared_strings = self.shared_strings
+            sheet = Sheet(self.workbook, shared_strings, self.styles, sheet_file)
+            if self.options['hyperlinks']:
+                # sheet relationships only resolve hyperlink targets
+                relationships_path = os.path.join(os.path.dirname(sheet_path),
+                                                  "_rels",
+                                                  os.path.basename(sheet_path) + ".rels")
+                sheet.relationships = self._parse(Relationships, relationships_path)
+            sheet.set_dateformat(self.options['dateformat'])
+            sheet.set_timeformat(self.options['timeformat'])
+            sheet.set_floatformat(self.options['floatformat'])
+            sheet.set_skip_empty_lines(self.options['skip_empty_lines'])
+            sheet.set_skip_trailing_columns(self.options['skip_trailing_columns'])
+            sheet.set_include_hyperlinks(self.options['hyperlinks'])
+            sheet.set_merge_cells(self.options['merge_cells'])
+            sheet.set_scifloat(self.options['scifloat'])
+            sheet.set_ignore_formats(self.options['ignore_formats'])
+            sheet.set_skip_hidden_rows(self.options['skip_hidden_rows'])
+            sheet.set_no_line_breaks(self.options['no_line_breaks'])
+            sheet.set_escape_strings(self.options['escape_strings'])
+            sheet.set_ignore_invalid_char_data(self.options['ignore_invalid_char_data'])
+            sheet.set_date_cache_size(self.options['date_cache_size'])
+            sheet.set_typed_values(self.options['typed_values'])
+            sheet.set_rows(self.rows[0], self.rows[1], self.options['head'])
+            if self.conditions:
+                sheet.set_row_filter(self.conditions)
+            if self.columns or self.options['column_names']:
+                sheet.set_columns(self.columns, self.options['column_names'])
+            sheet.set_parser(get_parser(self.options['parser']))
+        except Exception:
+            sheet_file.close()
+            raise
+        return sheet
 
     def _convert(self, sheet_index, outfile):
         closefile = False
+        buffering = self.options['output_buffer_size'] or -1
         if isinstance(outfile, str):
-            if sys.version_info[0] == 2:
-                outfile = open(outfile, 'wb+')
-            elif sys.version_info[0] == 3:
-                outfile = open(outfile, 'w+', encoding=self.options['outputencoding'], newline="")
-            else:
-                raise XlsxException("error: version of your Python is not supported: " + str(sys.version_info) + "\n")
+            outfile = open(outfile, 'w+', buffering=buffering, encoding=self.options['outputencoding'], newline="")
             closefile = True
         elif hasattr(outfile, "open"):
-            outfile = outfile.open("w+", encoding=self.options['outputencoding'], newline="")
+            outfile = outfile.open("w+", buffering=buffering, encoding=self.options['outputencoding'], newline="")
             closefile = True
 
         try:
             writer = csv.writer(outfile, quoting=self.options['quoting'], delimiter=self.options['delimiter'],
                                 lineterminator=self.options['lineterminator'])
 
-            sheets_filtered = list(filter(lambda s: s['index'] == sheet_index, self.workbook.sheets))
-            if len(sheets_filtered) == 0:
-                raise XlsxValueError("Sheet with index %i not found or can't be handled" % sheet_index)
-
-            sheet_path = None
-            # using sheet relation information
-            if 'relation_id' in sheets_filtered[0] and sheets_filtered[0]['relation_id'] is not None:
-
-                relation_id = sheets_filtered[0]['relation_id']
-                if relation_id in self.workbook.relationships.relationships and \
-                                'target' in self.workbook.relationships.relationships[relation_id]:
-                    relationship = self.workbook.relationships.relationships[relation_id]
-                    sheet_path = relationship['target']
-                    if not (sheet_path.startswith("/xl/") or sheet_path.startswith("xl/")):
-                        sheet_path = "/xl/" + sheet_path
-
-            sheet_file = None
-            if sheet_path is None:
-                sheet_path = "/xl/worksheets/sheet%i.xml" % sheet_index
-                sheet_file = self._filehandle(sheet_path)
-                if sheet_file is None:
-                    sheet_path = None
-            if sheet_path is None:
-                sheet_path = "/xl/worksheets/worksheet%i.xml" % sheet_index
-                sheet_file = self._filehandle(sheet_path)
-                if sheet_file is None:
-                    sheet_path = None
-            if sheet_path is None and sheet_index == 1:
-                sheet_path = self.content_types.types["worksheet"]
-                sheet_file = self._filehandle(sheet_path)
-                if sheet_file is None:
-                    sheet_path = None
-            if sheet_file is None and sheet_path is not None:
-                sheet_file = self._filehandle(sheet_path)
-            if sheet_file is None:
-                raise SheetNotFoundException("Sheet %i not found" % sheet_index)
-            sheet = Sheet(self.workbook, self.shared_strings, self.styles, sheet_file)
+            sheet = self._open_sheet(sheet_index)
             try:
-                relationships_path = os.path.join(os.path.dirname(sheet_path),
-                                                  "_rels",
-                                                  os.path.basename(sheet_path) + ".rels")
-                sheet.relationships = self._parse(Relationships, relationships_path)
-                sheet.set_dateformat(self.options['dateformat'])
-                sheet.set_timeformat(self.options['timeformat'])
-                sheet.set_floatformat(self.options['floatformat'])
-                sheet.set_skip_empty_lines(self.options['skip_empty_lines'])
-                sheet.set_skip_trailing_columns(self.options['skip_trailing_columns'])
-                sheet.set_include_hyperlinks(self.options['hyperlinks'])
-                sheet.set_merge_cells(self.options['merge_cells'])
-                sheet.set_scifloat(self.options['scifloat'])
-                sheet.set_ignore_formats(self.options['ignore_formats'])
-                sheet.set_skip_hidden_rows(self.options['skip_hidden_rows'])
-                sheet.set_no_line_breaks(self.options['no_line_breaks'])
-                if self.options['escape_strings'] and sheet.filedata:
-                    sheet.filedata = re.sub(r"(<v>[^<>]+)&#10;([^<>]+</v>)", r"\1\\n\2",
-                                            re.sub(r"(<v>[^<>]+)&#9;([^<>]+</v>)", r"\1\\t\2",
-                                                   re.sub(r"(<v>[^<>]+)&#13;([^<>]+</v>)", r"\1\\r\2", sheet.filedata.decode())))
                 sheet.to_csv(writer)
             finally:
-                sheet_file.close()
+                sheet.filehandle.close()
                 sheet.close()
         finally:
             if closefile:
                 outfile.close()
 
-    def _filehandle(self, filename):
-        for name in filter(lambda f: filename and f.lower() == filename.lower()[1:], self.ziphandle.namelist()):
-            # python2.4 fix
-            if not hasattr(self.ziphandle, "open"):
-                return StringIO(self.ziphandle.read(name))
-            return self.ziphandle.open(name, "r")
+    def resolve_part(self, path):
+        # type: (Optional[str]) -> Optional[str]
+        """
+         Returns the name of the zip member for a part path such as "/xl/styles.xml" or "xl/styles.xml",
+         matched case-insensitively, None if the workbook has no such part.
+        """
+        if not path:
+            return None
+        if path.startswith("/"):
+            path = path[1:]
+        return self.members.get(path.lower())
+
+    def open_part(self, path):
+        # type: (Optional[str]) -> Optional[IO[bytes]]
+        """Opens the part at path for reading, None if the workbook has no such part"""
+        name = self.resolve_part(path)
+        if name is None:
+            return None
+        return self.ziphandle.open(name, "r")
+
+    def get_sheet_path(self, sheet_index):
+        # type: (int) -> Optional[str]
+        """
+         Returns the part path of the sheet with the given index: the workbook relationship target if
+         there is one, otherwise the first existing of the conventional sheet part names; None if none
+         exists.
+        """
+        sheets_filtered = list(filter(lambda s: s['index'] == sheet_index, self.workbook.sheets))
+        if len(sheets_filtered) == 0:
+            raise XlsxValueError("Sheet with index %i not found or can't be handled" % sheet_index)
+
+        # using sheet relation information
+        if 'relation_id' in sheets_filtered[0] and sheets_filtered[0]['relation_id'] is not None:
+            relation_id = sheets_filtered[0]['relation_id']
+            if relation_id in self.workbook.relationships.relationships and \
+                            'target' in self.workbook.relationships.relationships[relation_id]:
+                relationship = self.workbook.relationships.relationships[relation_id]
+                sheet_path = relationship['target']
+                if not (sheet_path.startswith("/xl/") or sheet_path.startswith("xl/")):
+                    sheet_path = "/xl/" + sheet_path
+                return sheet_path
+
+        candidates = ["/xl/worksheets/sheet%i.xml" % sheet_index, "/xl/worksheets/worksheet%i.xml" % sheet_index]
+        if sheet_index == 1:
+            candidates.append(self.content_types.types["worksheet"])
+        for sheet_path in candidates:
+            if self.resolve_part(sheet_path) is not None:
+                return sheet_path
         return None
 
-    def _parse(self, klass, filename):
-        instance = klass()
-        filehandle = self._filehandle(filename)
+    def _parse_metadata(self):
+        self.content_types = self._parse(ContentTypes, "/[Content_Types].xml")
+        self.workbook = self._parse(Workbook, self.content_types.types["workbook"])
+        workbook_relationships = list(filter(lambda r: "book" in r, self.content_types.types["relationships"]))
+        if len(workbook_relationships) > 0:
+            self.workbook.relationships = self._parse(Relationships, workbook_relationships[0])
+        else:
+            self.workbook.relationships = Relationships()
+
+    def _parse_shared_strings(self, escape=True):
+        if self.options['shared_strings'] is not None:
+            return self.options['shared_strings']
+        if self.options['shared_strings_index']:
+            # built, and escaped or with line breaks replaced if asked to, by the instance that owns the index
+            return SharedStrings(strings=MappedStrings.open(self.options['shared_strings_index']))
+        strings = None
+        if self.options['mmap_shared_strings']:
+            strings = MappedStrings()
+        elif self.options['compact_shared_strings']:
+            strings = CompactStrings(self.options['shared_strings_cache_size'])
+        shared_strings = self._parse(SharedStrings, self.content_types.types["shared_strings"],
+                                     get_parser(self.options['parser']), strings)
+        if isinstance(strings, MappedStrings):
+            strings.finish()
+        if escape:
+            self._prepare_shared_strings(shared_strings)
+        return shared_strings
+
+    def _parse_selected_strings(self, sheet_path):
+        """Parses only the shared strings referenced by the sheet at sheet_path"""
+        refs = self._parse(SharedStringRefs, sheet_path, get_parser(self.options['parser']))
+        shared_strings = self._parse(SharedStrings, self.content_types.types["shared_strings"],
+                                     get_parser(self.options['parser']), {}, refs.indexes)
+        self._prepare_shared_strings(shared_strings)
+        return shared_strings
+
+    def _prepare_shared_strings(self, shared_strings):
+        """Applies escape_strings or no_line_breaks once per shared string instead of once per cell"""
+        if self.options['escape_strings']:
+            shared_strings.escape_strings()
+        elif self.options['no_line_breaks']:
+            shared_strings.replace_line_breaks()
+
+    def _parse(self, klass, filename, *args):
+        instance = klass(*args)
+        filehandle = self.open_part(filename)
         if filehandle:
             instance.parse(filehandle)
             filehandle.close()
@@ -449,65 +1341,46 @@ class Workbook:
         self.date1904 = False
 
     def parse(self, filehandle):
-        workbookDoc = minidom.parseString(filehandle.read())
-        if workbookDoc.firstChild.namespaceURI:
-            fileVersion = workbookDoc.firstChild.getElementsByTagNameNS(workbookDoc.firstChild.namespaceURI,
-                                                                        "fileVersion")
-        else:
-            fileVersion = workbookDoc.firstChild.getElementsByTagName("fileVersion")
-        if len(fileVersion) == 0:
-            self.appName = DEFAULT_APP_PATH
-        else:
-            try:
-                if workbookDoc.firstChild.namespaceURI:
-                    self.appName = \
-                        workbookDoc.firstChild.getElementsByTagNameNS(
-                            workbookDoc.firstChild.namespaceURI, "fileVersion")[0]._attrs['appName'].value
-                else:
-                    self.appName = workbookDoc.firstChild.getElementsByTagName("fileVersion")[0]._attrs['appName'].value
-            except KeyError:
-                # no app name
-                self.appName = DEFAULT_APP_PATH
-        try:
-            if workbookDoc.firstChild.namespaceURI:
-                self.date1904 = \
-                    workbookDoc.firstChild.getElementsByTagNameNS(
-                        workbookDoc.firstChild.namespaceURI, "workbookPr")[0]._attrs['date1904'].value.lower().strip() \
-                    != "false"
-            else:
-                self.date1904 = \
-                    workbookDoc.firstChild.getElementsByTagName("workbookPr")[0] \
-                        ._attrs['date1904'].value.lower().strip() \
-                    != "false"
-        except:
-            pass
+        state = {'match': None, 'fileVersion': None, 'workbookPr': None, 'sheets': None, 'sheets_done': False}
 
-        if workbookDoc.firstChild.namespaceURI:
-            sheets = workbookDoc.firstChild.getElementsByTagNameNS(workbookDoc.firstChild.namespaceURI, "sheets")[0]
-        else:
-            sheets = workbookDoc.firstChild.getElementsByTagName("sheets")[0]
-        if workbookDoc.firstChild.namespaceURI:
-            sheetNodes = sheets.getElementsByTagNameNS(workbookDoc.firstChild.namespaceURI, "sheet")
-        else:
-            sheetNodes = sheets.getElementsByTagName("sheet")
-        for i, sheetNode in enumerate(sheetNodes):
-            attrs = sheetNode._attrs
-            name = attrs["name"].value
-            state = None
-            if 'state' in attrs:
-                state = attrs["state"].value
-            relation_id = None
-            if 'r:id' in attrs:
-                relation_id = attrs['r:id'].value
-            self.sheets.append(
-                {
-                    'name': name,
-                    'relation_id': relation_id,
-                    'index': i + 1,
-                    'id': i + 1, # remove id starting 0.8.0 version
-                    'state': state
-                }
-            )
+        def start(uri, local, qname, attrs, depth):
+            match = state['match']
+            if match is None:
+                state['match'] = dict((name, ns_matcher(uri, name))
+                                      for name in ("fileVersion", "workbookPr", "sheets", "sheet"))
+                return
+            if state['fileVersion'] is None and match["fileVersion"](uri, local, qname):
+                state['fileVersion'] = attrs
+            if state['workbookPr'] is None and match["workbookPr"](uri, local, qname):
+                state['workbookPr'] = attrs
+            if state['sheets'] is not None:
+                if match["sheet"](uri, local, qname):
+                    name = attrs["name"]
+                    self.sheets.append(
+                        {
+                            'name': name,
+                            'relation_id': attrs.get('r:id'),
+                            'index': len(self.sheets) + 1,
+                            'id': len(self.sheets) + 1, # remove id starting 0.8.0 version
+                            'state': attrs.get('state')
+                        }
+                    )
+            elif not state['sheets_done'] and match["sheets"](uri, local, qname):
+                state['sheets'] = depth
+
+        def end(uri, local, qname, depth):
+            if state['sheets'] == depth:
+                state['sheets'] = None
+                state['sheets_done'] = True
+
+        parse_namespaced(filehandle, start, end)
+
+        # no fileVersion or no app name
+        self.appName = (state['fileVersion'] or {}).get('appName', DEFAULT_APP_PATH)
+        if state['workbookPr'] is not None and 'date1904' in state['workbookPr']:
+            self.date1904 = state['workbookPr']['date1904'].lower().strip() != "false"
+        if not state['sheets_done']:
+            raise InvalidXlsxFileException("Workbook has no sheets")
 
 
 class ContentTypes:
@@ -517,17 +1390,16 @@ class ContentTypes:
             self.types[type] = None
 
     def parse(self, filehandle):
-        types = minidom.parseString(filehandle.read()).firstChild
-        if not types:
-            return
-        if types.namespaceURI:
-            overrideNodes = types.getElementsByTagNameNS(types.namespaceURI, "Override")
-        else:
-            overrideNodes = types.getElementsByTagName("Override")
-        for override in overrideNodes:
-            attrs = override._attrs
-            type = attrs.get('ContentType').value
-            name = attrs.get('PartName').value
+        match = []
+
+        def start(uri, local, qname, attrs, depth):
+            if not match:
+                match.append(ns_matcher(uri, "Override"))
+                return
+            if not match[0](uri, local, qname):
+                return
+            type = attrs.get('ContentType')
+            name = attrs.get('PartName')
             if type == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml":
                 self.types["workbook"] = name
             elif type == "application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml":
@@ -542,6 +1414,8 @@ class ContentTypes:
                     self.types["relationships"] = list()
                 self.types["relationships"].append(name)
 
+        parse_namespaced(filehandle, start)
+
         if self.types["workbook"] is None:
             self.types["workbook"] = DEFAULT_WORKBOOK_PATH
         if self.types["relationships"] is None:
@@ -554,64 +1428,94 @@ class Relationships:
         self.relationships = {}
 
     def parse(self, filehandle):
-        doc = minidom.parseString(filehandle.read())
-        if doc.namespaceURI:
-            relationships = doc.getElementsByTagNameNS(doc.namespaceURI, "Relationships")
-        else:
-            relationships = doc.getElementsByTagName("Relationships")
-        if not relationships:
-            return
-        if doc.namespaceURI:
-            relationshipNodes = relationships[0].getElementsByTagNameNS(doc.namespaceURI, "Relationship")
-        else:
-            relationshipNodes = relationships[0].getElementsByTagName("Relationship")
-        for rel in relationshipNodes:
-            attrs = rel._attrs
-            rId = attrs.get('Id')
-            if rId:
-                vtype = attrs.get('Type')
-                target = attrs.get('Target')
-                self.relationships[str(rId.value)] = {
-                    "type": vtype and str(vtype.value) or None,
-                    "target": target and str(target.value) or None
-                }
+        # only the first <Relationships> element (by qualified name) is read
+        state = {'depth': None, 'done': False}
+
+        def start(uri, local, qname, attrs, depth):
+            if state['depth'] is not None:
+                if qname == "Relationship":
+                    rId = attrs.get('Id')
+                    if rId is not None:
+                        self.relationships[str(rId)] = {
+                            "type": attrs.get('Type') or None,
+                            "target": attrs.get('Target') or None
+                        }
+            elif not state['done'] and qname == "Relationships":
+                state['depth'] = depth
+
+        def end(uri, local, qname, depth):
+            if state['depth'] == depth:
+                state['depth'] = None
+                state['done'] = True
+
+        parse_namespaced(filehandle, start, end)
 
 
 class Styles:
     def __init__(self):
         self.numFmts = {}
         self.cellXfs = []
+        self.cellFormats = []
 
     def parse(self, filehandle):
-        styles = minidom.parseString(filehandle.read()).firstChild
+        # numFmts and cellXfs are only read when the part has exactly one of each, children of every
+        # occurrence are collected and resolved once the whole part is read
+        state = {'match': None, 'numFmts': [], 'cellXfs': [], 'children': None, 'depth': None, 'xf_only': False}
+
+        def start(uri, local, qname, attrs, depth):
+            match = state['match']
+            if match is None:
+                state['match'] = (ns_matcher(uri, "numFmts"), ns_matcher(uri, "cellXfs"))
+                return
+            if state['children'] is not None:
+                if depth == state['depth'] + 1 and (not state['xf_only'] or qname == "xf" or qname.endswith(":xf")):
+                    state['children'].append(attrs)
+                return
+            for kind, xf_only, matches in (('numFmts', False, match[0]), ('cellXfs', True, match[1])):
+                if matches(uri, local, qname):
+                    state['children'] = []
+                    state[kind].append(state['children'])
+                    state['depth'] = depth
+                    state['xf_only'] = xf_only
+
+        def end(uri, local, qname, depth):
+            if state['depth'] == depth:
+                state['children'] = state['depth'] = None
+
+        parse_namespaced(filehandle, start, end)
+
         # numFmts
-        if styles.namespaceURI:
-            numFmtsElement = styles.getElementsByTagNameNS(styles.namespaceURI, "numFmts")
-        else:
-            numFmtsElement = styles.getElementsByTagName("numFmts")
-        if len(numFmtsElement) == 1:
-            for numFmt in numFmtsElement[0].childNodes:
-                if numFmt.nodeType == minidom.Node.ELEMENT_NODE:
-                    numFmtId = int(numFmt._attrs['numFmtId'].value)
-                    formatCode = numFmt._attrs['formatCode'].value.lower().replace('\\', '')
-                    self.numFmts[numFmtId] = formatCode
-
-        if styles.namespaceURI:
-            cellXfsElement = styles.getElementsByTagNameNS(styles.namespaceURI, "cellXfs")
-        else:
-            cellXfsElement = styles.getElementsByTagName("cellXfs")
-        if len(cellXfsElement) == 1:
-            for cellXfs in cellXfsElement[0].childNodes:
-                if cellXfs.nodeType != minidom.Node.ELEMENT_NODE or not (
-                                cellXfs.nodeName == "xf" or cellXfs.nodeName.endswith(":xf")):
-                    continue
-                if cellXfs._attrs and 'numFmtId' in cellXfs._attrs:
-                    numFmtId = int(cellXfs._attrs['numFmtId'].value)
+        if len(state['numFmts']) == 1:
+            for attrs in state['numFmts'][0]:
+                numFmtId = int(attrs['numFmtId'])
+                formatCode = attrs['formatCode'].lower().replace('\\', '')
+                self.numFmts[numFmtId] = formatCode
+
+        if len(state['cellXfs']) == 1:
+            for attrs in state['cellXfs'][0]:
+                if attrs and 'numFmtId' in attrs:
+                    numFmtId = int(attrs['numFmtId'])
                     if self.chk_exists(numFmtId) == None:
-                        numFmtId = int(cellXfs._attrs['applyNumberFormat'].value)
+                        numFmtId = int(attrs['applyNumberFormat'])
                     self.cellXfs.append(numFmtId)
                 else:
                     self.cellXfs.append(None)
+        self.compile()
+
+    def compile(self):
+        """Resolve every cellXfs entry to (numFmtId, format_str, format_type) once, so that
+        sheets do not have to look up and classify the number format for each cell.
+
+        format_type is the FORMATS value for known formats, 'datetime' for custom formats
+        that look like a date or time (the cell value decides which one), or None."""
+        self.cellFormats = []
+        for xfs_numfmt in self.cellXfs:
+            format_str = "general"
+            if xfs_numfmt in self.numFmts:
+                format_str = self.numFmts[xfs_numfmt]
+            elif xfs_numfmt in STANDARD_FORMATS:
+                format_str = STANDARD_FORMATS[xfs_numfmt]
+            self.cellFormats.append((xfs_numfmt, format_str, classify_format(format_str)))
 
     # When Unknown Numformat ID assign applyNumberFormat
     def chk_exists(self, numFmtId):
@@ -624,64 +1528,360 @@ class Styles:
         return format_str
 
 
+class CompactStrings:
+    """
+     Compact list-like store for shared strings: every string is kept UTF-8 encoded in one
+     contiguous buffer with its end offset in an array, and is decoded again on access.
+     Saves the per-object overhead of a list of str for workbooks with millions of unique
+     strings. cache_size most recently used strings are kept decoded (0 to disable).
+    """
+
+    def __init__(self, cache_size=0):
+        # type: (int) -> None
+        self.buffer = bytearray()
+        self.offsets = array('q', [0])
+        self.cache_size = cache_size
+        self._lookup = self._decode
+        if cache_size > 0:
+            self._lookup = functools.lru_cache(maxsize=cache_size)(self._decode)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        # type: (int) -> str
+        if index < 0:
+            index += len(self.offsets) - 1
+            if index < 0:
+                raise IndexError("shared string index out of range")
+        return self._lookup(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._decode(i)
+
+    def _decode(self, index):
+        # type: (int) -> str
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode("utf-8", "surrogatepass")
+
+    def append(self, value):
+        # type: (str) -> None
+        self.buffer += value.encode("utf-8", "surrogatepass")
+        self.offsets.append(len(self.buffer))
+
+    def transform(self, func):
+        """Replaces every string s with func(s)"""
+        buffer = bytearray()
+        offsets = array('q', [0])
+        for value in self:
+            buffer += func(value).encode("utf-8", "surrogatepass")
+            offsets.append(len(buffer))
+        self.buffer = buffer
+        self.offsets = offsets
+        if self.cache_size > 0:
+            self._lookup.cache_clear()
+
+
+class MappedStrings:
+    """
+     On-disk list-like store for shared strings that are too big to keep in memory. Strings are
+     streamed UTF-8 encoded into a temporary index file followed by a table of fixed-width end
+     offsets, once finish() is called the file is mmap-ed and lookups decode straight from the
+     mapping.
+
+     Index layout: header (MAGIC, count, table position), string data, padding to 8 bytes and
+     (count + 1) int64 offsets. Other processes can map a finished index read-only with
+     MappedStrings.open(path); the file is removed when the store that created it is closed.
+     pack() writes the same layout into any writable buffer (e.g. shared memory), from_buffer()
+     serves lookups from it.
+    """
+    MAGIC = b"XLSXSST2"
+    HEADER_FORMAT = "=8sqq"
+    HEADER_SIZE = 24  # struct.calcsize(HEADER_FORMAT)
+    FLUSH_OFFSETS = 65536  # offsets held in memory before they are spilled to disk
+
+    def __init__(self, directory=None):
+        # type: (Optional[str]) -> None
+        import tempfile
+        self.file = tempfile.NamedTemporaryFile(prefix="xlsx2csv-sst-", suffix=".idx", dir=directory, delete=False)
+        self.file.write(b"\0" * self.HEADER_SIZE)
+        self.path = self.file.name
+        self.owner = True
+        self.size = self.HEADER_SIZE
+        self.count = 0
+        self.pending = array('q', [self.size])
+        self.spilled = tempfile.TemporaryFile()
+        self.handle = None
+        self.map = None
+        self.offsets = None
+
+    @classmethod
+    def open(cls, path):
+        # type: (str) -> MappedStrings
+        """Maps an index finished by another store read-only"""
+        import mmap
+        with open(path, "rb") as f:
+            handle = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self = cls.from_buffer(handle, handle)
+        self.path = path
+        return self
+
+    @classmethod
+    def from_buffer(cls, buffer, handle=None):
+        # type: (Any, Any) -> MappedStrings
+        """Serves lookups from an index in buffer, handle.close() is called on close()"""
+        self = cls.__new__(cls)
+        self.file = None
+        self.path = None
+        self.owner = False
+        self.spilled = None
+        self.pending = None
+        self._attach(buffer, handle)
+        return self
+
+    @classmethod
+    def pack(cls, strings, allocate):
+        """
+         Writes strings as an index into the writable buffer returned by allocate(size), which
+         may be larger than asked for, and returns that buffer.
+        """
+        offsets = array('q', [cls.HEADER_SIZE])
+        size = cls.HEADER_SIZE
+        for value in strings:
+            size += len(value.encode("utf-8", "surrogatepass"))
+            offsets.append(size)
+        table = size + (-size % 8)
+        buffer = allocate(table + len(offsets) * 8)
+        for i, value in enumerate(strings):
+            buffer[offsets[i]:offsets[i + 1]] = value.encode("utf-8", "surrogatepass")
+        buffer[table:table + len(offsets) * 8] = offsets.tobytes()
+        import struct
+        struct.pack_into(cls.HEADER_FORMAT, buffer, 0, cls.MAGIC, len(offsets) - 1, table)
+        return buffer
+
+    def _attach(self, buffer, handle):
+        import struct
+        magic, count, table = struct.unpack_from(self.HEADER_FORMAT, buffer, 0)
+        if magic != self.MAGIC:
+            raise XlsxException("Invalid shared strings index")
+        self.handle = handle
+        self.map = buffer
+        self.count = count
+        self.offsets = memoryview(buffer)[table:table + (count + 1) * 8].cast('q')
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        # type: (int) -> str
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("shared string index out of range")
+        return str(self.map[self.offsets[index]:self.offsets[index + 1]], "utf-8", "surrogatepass")
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def append(self, value):
+        # type: (str) -> None
+        data = value.encode("utf-8", "surrogatepass")
+        self.file.write(data)
+        self.size += len(data)
+        self.count += 1
+        self.pending.append(self.size)
+        if len(self.pending) >= self.FLUSH_OFFSETS:
+            self.pending.tofile(self.spilled)
+            self.pending = array('q')
+
+    def finish(self):
+        """Writes the offset table and maps the index, no-op once finished"""
+        if self.map is not None:
+            return
+        import mmap, struct
+        table = self.size + (-self.size % 8)
+        self.file.write(b"\0" * (table - self.size))
+        self.spilled.seek(0)
+        while True:
+            chunk = self.spilled.read(1 << 20)
+            if not chunk:
+                break
+            self.file.write(chunk)
+        self.spilled.close()
+        self.spilled = None
+        self.pending.tofile(self.file)
+        self.pending = None
+        self.file.seek(0)
+        self.file.write(struct.pack(self.HEADER_FORMAT, self.MAGIC, self.count, table))
+        self.file.flush()
+        handle = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._attach(handle, handle)
+
+    def transform(self, func):
+        """Replaces every string s with func(s), rebuilding the index"""
+        self.finish()
+        rebuilt = MappedStrings(os.path.dirname(self.path) if self.path else None)
+        for value in self:
+            rebuilt.append(func(value))
+        rebuilt.finish()
+        self.close()
+        self.__dict__.update(rebuilt.__dict__)
+        rebuilt.owner = False
+
+    def close(self):
+        if self.offsets is not None:
+            self.offsets.release()
+            self.offsets = None
+        self.map = None
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+        if self.spilled is not None:
+            self.spilled.close()
+            self.spilled = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.owner:
+            self.owner = False
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
 class SharedStrings:
-    def __init__(self):
-        self.parser = None
-        self.strings = []
+    def __init__(self, parser=None, strings=None, wanted=None):
+        self.parser = parser or ExpatParser()
+        self.strings = strings if strings is not None else []
+        self.wanted = wanted  # indexes to keep, strings is then a dict of index to string
+        self.count = 0
         self.si = False
         self.t = False
         self.rPh = False
         self.value = ""
+        self.startHandlers = ElementHandlers({
+            'si': self.handleStartSi,
+            't': self.handleStartT,
+            'rPh': self.handleStartRPh,
+        })
+        self.endHandlers = ElementHandlers({
+            'si': self.handleEndSi,
+            't': self.handleEndT,
+            'rPh': self.handleEndRPh,
+        })
 
     def parse(self, filehandle):
-        self.parser = xml.parsers.expat.ParserCreate()
-        self.parser.CharacterDataHandler = self.handleCharData
-        self.parser.buffer_text = True
-        self.parser.StartElementHandler = self.handleStartElement
-        self.parser.EndElementHandler = self.handleEndElement
-        self.parser.ParseFile(filehandle)
+        self.parser.parse(self, filehandle)
 
     def escape_strings(self):
-        for i in range(0, len(self.strings)):
-            self.strings[i] = self.strings[i].replace("\r", "\\r").replace("\n", "\\n").replace("\t", "\\t")
+        self.transform(lambda s: s.translate(ESCAPE_TABLE))
 
     def replace_line_breaks(self):
-        for i in range(0, len(self.strings)):
-            self.strings[i] = self.strings[i].replace("\r", " ").replace("\n", " ").replace("\t", " ")
+        # the \r expat left in a cell as _x000D_ is dropped first, as the sheet would for the cell
+        self.transform(lambda s: s.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n").translate(LINE_BREAK_TABLE))
+
+    def transform(self, func):
+        if isinstance(self.strings, (CompactStrings, MappedStrings)):
+            self.strings.transform(func)
+            return
+        indexes = self.strings.keys() if isinstance(self.strings, dict) else range(0, len(self.strings))
+        for i in indexes:
+            self.strings[i] = func(self.strings[i])
+
+    def close(self):
+        if isinstance(self.strings, MappedStrings):
+            self.strings.close()
 
     def handleCharData(self, data):
         if self.t:
             self.value += data
 
     def handleStartElement(self, name, attrs):
-        # ignore namespace
-        i = name.find(":")
-        if i >= 0:
-            name = name[i + 1:]
+        handler = self.startHandlers[name]
+        if handler is not None:
+            handler()
 
-        if name == 'si':
-            self.si = True
-            self.value = ""
-        elif name == 't' and self.rPh:
+    def handleEndElement(self, name):
+        handler = self.endHandlers[name]
+        if handler is not None:
+            handler()
+
+    def handleStartSi(self):
+        self.si = True
+        self.value = ""
+
+    def handleStartT(self):
+        if self.rPh:
             self.t = False
-        elif name == 't' and self.si:
+        elif self.si:
             self.t = True
-        elif name == 'rPh':
-            self.rPh = True
 
-    def handleEndElement(self, name):
-        # ignore namespace
-        i = name.find(":")
-        if i >= 0:
-            name = name[i + 1:]
+    def handleStartRPh(self):
+        self.rPh = True
 
-        if name == 'si':
-            self.si = False
+    def handleEndSi(self):
+        self.si = False
+        if self.wanted is None:
             self.strings.append(self.value)
-        elif name == 't':
-            self.t = False
-        elif name == 'rPh':
-            self.rPh = False
+        elif self.count in self.wanted:
+            self.strings[self.count] = self.value
+        self.count += 1
+
+    def handleEndT(self):
+        self.t = False
+
+    def handleEndRPh(self):
+        self.rPh = False
+
+
+class SharedStringRefs:
+    """Collects the shared string indexes referenced by the t="s" cells of a sheet"""
+
+    def __init__(self, parser=None):
+        self.parser = parser or ExpatParser()
+        self.indexes = set()
+        self.shared = False
+        self.in_value = False
+        self.value = ""
+        self.startHandlers = ElementHandlers({
+            'c': self.handleStartCell,
+            'v': self.handleStartValue,
+        })
+        self.endHandlers = ElementHandlers({
+            'v': self.handleEndValue,
+        })
+
+    def parse(self, filehandle):
+        self.parser.parse(self, filehandle)
+
+    def handleCharData(self, data):
+        if self.in_value:
+            self.value += data
+
+    def handleStartElement(self, name, attrs):
+        handler = self.startHandlers[name]
+        if handler is not None:
+            handler(attrs)
+
+    def handleEndElement(self, name):
+        handler = self.endHandlers[name]
+        if handler is not None:
+            handler()
+
+    def handleStartCell(self, attrs):
+        self.shared = attrs.get("t") == "s"
+
+    def handleStartValue(self, attrs):
+        if self.shared:
+            self.in_value = True
+            self.value = ""
+
+    def handleEndValue(self):
+        if self.in_value:
+            self.in_value = False
+            self.indexes.add(int(self.value))
 
 
 XMLPARSER_WINDOWS_NEWLINE_STR = "_x000D_\n"
@@ -689,8 +1889,7 @@ XMLPARSER_WINDOWS_NEWLINE_STR = "_x000D_\n"
 
 class Sheet:
     def __init__(self, workbook, sharedString, styles, filehandle):
-        self.py3 = sys.version_info[0] == 3
-        self.parser = None
+        self.parser = ExpatParser()
         self.writer = None
         self.sharedString = None
         self.styles = None
@@ -702,14 +1901,28 @@ class Sheet:
         self.in_cell = False
         self.in_cell_value = False
 
-        self.columns = {}
+        self.blankRow = []  # template the row buffer of every row is copied from
+        self.rowValues = []
+        self.rowWidth = 0
+        self.rowBatch = []
         self.lastRowNum = 0
         self.rowNum = None
+        self.rowIndex = 0
         self.colType = None
         self.cellId = None
         self.s_attr = None
         self.data = None
         self.max_columns = -1
+        self.projection = None  # sheet column index -> output column index, see set_columns
+        self.projectedColumns = []
+        self.columnLimit = MAX_COLUMNS  # cells from this column on are dropped, see handleDimension
+        self.columnNames = None  # header names not resolved into the projection yet
+        self.firstRow = 1  # see set_rows
+        self.lastRow = None
+        self.rowsLeft = None  # rows still to be written with head, None for no limit
+        self.rowFilter = None  # [(column index, test)] every written row passes, see set_row_filter
+        self.filterColumns = set()
+        self.rowCells = []  # (index, cellId, colType, s_attr, data) of the cells of a row waiting for the filter
 
         self.dateformat = None
         self.timeformat = "%H:%M"  # default time format
@@ -718,24 +1931,55 @@ class Sheet:
         self.skip_trailing_columns = False
 
         self.filedata = None
+        self.trailingElements = None  # type: Optional[Dict[str, bytes]]
         self.filehandle = filehandle
         self.workbook = workbook
         self.sharedStrings = sharedString.strings
         self.styles = styles
 
-        self.hyperlinks = {}
-        self.mergeCells = {}
+        self.hyperlinks = {}  # single cell reference -> (document order, target)
+        self.hyperlinkRanges = RangeIndex()  # (top, bottom, left, right, document order, target)
+        self.mergeRanges = RangeIndex()  # (top, bottom, left, right), see set_merge_cells
+        self.mergeLefts = []  # left column of every active merge range, for bisect
+        self.mergeValues = {}  # (top, left) -> value of the top left cell of an active range
         self.ignore_formats = []
         self.skip_hidden_rows = False
         self.no_line_breaks = False
+        self.escape_strings = False
+        self.scifloat = False
+        self.ignore_invalid_char_data = False
+        self.date_cache_size = 4096
+        self.typed_values = False
+        self.formatters = []
+        self.general_formatter = None
 
         self.colIndex = 0
         self.colNum = ""
+        self.colStart = -1
+
+        self.startHandlers = ElementHandlers({
+            'c': self.handleStartCell,
+            'v': self.handleStartValue,
+            't': self.handleStartValue,
+            'row': self.handleStartRow,
+            'sheetData': self.handleStartSheetData,
+            'dimension': self.handleDimension,
+        })
+        self.endHandlers = ElementHandlers({
+            'c': self.handleEndCell,
+            'v': self.handleEndValue,
+            't': self.handleEndValue,
+            'row': self.handleEndRow,
+            'sheetData': self.handleEndSheetData,
+        })
 
     def close(self):
         # Make sure Worksheet is closed, parsers lib does not have a close() function, so simply delete it
         self.parser = None
 
+    def set_parser(self, parser):
+        self.parser = parser
+
     def set_dateformat(self, dateformat):
         self.dateformat = dateformat
 
@@ -761,44 +2005,155 @@ class Sheet:
     def set_no_line_breaks(self, no_line_breaks):
         self.no_line_breaks = no_line_breaks
 
+    def set_escape_strings(self, escape_strings):
+        self.escape_strings = escape_strings
+
+    def set_ignore_invalid_char_data(self, ignore_invalid_char_data):
+        self.ignore_invalid_char_data = ignore_invalid_char_data
+
+    def set_date_cache_size(self, date_cache_size):
+        self.date_cache_size = date_cache_size
+
+    def set_rows(self, first=1, last=None, head=None):
+        """
+         Converts only the rows numbered first to last, last None for no end, and at most head rows of output.
+         Parsing stops as soon as the last wanted row is written, the rest of the part is not decompressed.
+         Column names given to set_columns are still looked up in the first row with cells, written only
+         when it is in the range.
+        """
+        self.firstRow = first
+        self.lastRow = last
+        self.rowsLeft = head
+        self.lastRowNum = first - 1  # no empty lines for the rows before first
+
+    def set_row_filter(self, conditions):
+        """
+         Writes only the rows whose cells pass every (column index, test) condition, see parse_condition. Tests
+         get the raw value of the cell: shared strings looked up, booleans as TRUE or FALSE, anything else as in
+         the sheet, dates as serial numbers; missing cells are "". Cells are converted only once their row
+         passes, rows that don't are neither formatted nor written. Missing rows aren't written as empty lines,
+         and the header row column names are looked up in is always kept.
+        """
+        self.rowFilter = list(conditions)
+        self.filterColumns = set(column for column, _ in self.rowFilter)
+
+    def _filter_row(self):
+        # type: () -> bool
+        if self.columnNames is not None:
+            passed = True
+        else:
+            values = {}
+            for index, _, colType, _, data in self.rowCells:
+                if index in self.filterColumns:
+                    values[index] = self._raw_value(colType, data)
+            passed = all(test(values.get(column, "")) for column, test in self.rowFilter)
+        self._place_row_cells(passed)
+        return passed
+
+    def _place_row_cells(self, passed):
+        cells, self.rowCells = self.rowCells, []
+        for index, cellId, colType, s_attr, data in cells:
+            # merge anchors of rows that aren't written are still needed for the cells they cover
+            if passed or (self.mergeRanges.active and self._is_merge_anchor(index)):
+                self.cellId = cellId
+                self.colType = colType
+                self.s_attr = s_attr
+                self.data = data
+                if data:
+                    self._convert_value()
+                self._place_cell(index)
+        return passed
+
+    def _raw_value(self, colType, data):
+        if colType == "s" and data:
+            return self.sharedStrings[int(data)]
+        if colType == "b" and (data == "1" or data == "0"):
+            return "TRUE" if data == "1" else "FALSE"
+        return data
+
+    def set_columns(self, columns, names=None):
+        """
+         Converts only the given columns, in the given order: columns are zero based column indexes, names
+         are looked up in the first row that has cells and come after them. Other cells are skipped as soon
+         as they start, before their value is read or converted.
+        """
+        self.projectedColumns = list(columns)
+        if names:
+            # the first row is converted in full to find the names in, see _resolve_column_names
+            self.columnNames = list(names)
+        else:
+            self._set_projection(self.projectedColumns)
+
+    def _set_projection(self, columns):
+        self.projection = {}
+        for column in columns:
+            self.projection.setdefault(column, len(self.projection))
+        self.columns_count = len(self.projection)
+
+    def _resolve_column_names(self, header):
+        columns = list(self.projectedColumns)
+        for name in self.columnNames:
+            if name not in header:
+                raise XlsxException("Column '%s' not found" % name)
+            columns.append(header.index(name))
+        self.columnNames = None
+        self._set_projection(columns)
+        return [header[column] if column < len(header) else "" for column in self.projection]
+
+    def _is_merge_anchor(self, index):
+        active = self.mergeRanges.active
+        i = bisect.bisect_right(self.mergeLefts, index) - 1
+        return i >= 0 and active[i][2] == index and active[i][0] == self.rowIndex
+
+    def set_typed_values(self, typed_values):
+        """
+         Typed values skip all formatting: numbers become int or float, dates datetime.datetime, times
+         datetime.time and booleans bool, classified by number format as usual. Everything else stays str.
+         dateformat, timeformat, floatformat and scifloat have no effect, scientific notation is always a float.
+        """
+        self.typed_values = typed_values
+
+    def _read_trailing_element(self, name):
+        # type: (str) -> Optional[bytes]
+        """
+         Returns the bytes of the element name that follows sheetData, see find_trailing_elements. All
+         TRAILING_ELEMENTS are found in one separate forward pass over the part, which is rewound, so
+         to_csv still streams it.
+        """
+        if self.trailingElements is None:
+            if not self.filedata:
+                seekable = getattr(self.filehandle, "seekable", None)
+                if seekable is not None and seekable():
+                    try:
+                        self.trailingElements = find_trailing_elements(self.filehandle, TRAILING_ELEMENTS)
+                    finally:
+                        self.filehandle.seek(0)
+                    return self.trailingElements.get(name)
+                # members of an archive that can't seek can't be rewound, keep the part in memory
+                self.filedata = self.filehandle.read()
+            self.trailingElements = find_trailing_elements(io.BytesIO(self.filedata), TRAILING_ELEMENTS)
+        return self.trailingElements.get(name)
+
     def set_merge_cells(self, mergecells):
         if not mergecells:
             return
-        if not self.filedata:
-            self.filedata = self.filehandle.read()
-        data = str(self.filedata)  # python3: convert byte buffer to string
-
-        # find worksheet tag, we need namespaces from it
-        start = data.find("<worksheet")
-        if start < 0:
+        data = self._read_trailing_element("mergeCells")
+        if data is None:
             return
-        end = data.find(">", start)
-        worksheet = data[start: end + 1]
 
-        # find hyperlinks part
-        start = data.find("<mergeCells")
-        if start < 0:
-            # hyperlinks not found
-            return
-        end = data.find("</mergeCells>")
-        data = data[start: end + 13]
+        ranges = []
 
-        # parse hyperlinks
-        doc = minidom.parseString(worksheet + data + "</worksheet>").firstChild
+        def handleStartElement(name, attrs):
+            if (name == "mergeCell" or name.endswith(":mergeCell")) and 'ref' in attrs:
+                rng = split_range_ref(attrs['ref'])
+                if rng is not None:
+                    ranges.append(rng)
 
-        if doc.namespaceURI:
-            mergeCells = doc.getElementsByTagNameNS(doc.namespaceURI, "mergeCell")
-        else:
-            mergeCells = doc.getElementsByTagName("mergeCell")
-        for mergeCell in mergeCells:
-            attrs = mergeCell._attrs
-            if 'ref' in attrs.keys():
-                rangeStr = attrs['ref'].value
-                rng = rangeStr.split(":")
-                if len(rng) > 1:
-                    for cell in self._range(rangeStr):
-                        self.mergeCells[cell] = {}
-                        self.mergeCells[cell]['copyFrom'] = rng[0]
+        # the element is parsed on its own, so prefixes are left unresolved
+        parser = xml.parsers.expat.ParserCreate()
+        parser.StartElementHandler = handleStartElement
+        parser.Parse(data, True)
+        self.mergeRanges = RangeIndex(ranges)
 
     def set_scifloat(self, scifloat):
         self.scifloat = scifloat
@@ -806,315 +2161,469 @@ class Sheet:
     def set_include_hyperlinks(self, hyperlinks):
         if not hyperlinks or not self.relationships or not self.relationships.relationships:
             return
-        # we must read file first to get hyperlinks, but we don't wont to parse whole file
-        if not self.filedata:
-            self.filedata = self.filehandle.read()
-        data = str(self.filedata)  # python3: convert byte buffer to string
-
-        # find worksheet tag, we need namespaces from it
-        start = data.find("<worksheet")
-        if start < 0:
+        data = self._read_trailing_element("hyperlinks")
+        if data is None:
             return
-        end = data.find(">", start)
-        worksheet = data[start: end + 1]
 
-        # find hyperlinks part
-        start = data.find("<hyperlinks>")
-        if start < 0:
-            # hyperlinks not found
-            return
-        end = data.find("</hyperlinks>")
-        data = data[start: end + 13]
+        relationships = self.relationships.relationships
+        cells = self.hyperlinks
+        ranges = []
+        order = itertools.count()
 
-        # parse hyperlinks
-        doc = minidom.parseString(worksheet + data + "</worksheet>").firstChild
-        if doc.namespaceURI:
-            hiperlinkNodes = doc.getElementsByTagNameNS(doc.namespaceURI, "hyperlink")
-        else:
-            hiperlinkNodes = doc.getElementsByTagName("hyperlink")
-        for hlink in hiperlinkNodes:
-            attrs = hlink._attrs
+        def handleStartElement(name, attrs):
+            if not (name == "hyperlink" or name.endswith(":hyperlink")):
+                return
             ref = rId = None
             for k in attrs.keys():
                 if k == "ref":
-                    ref = str(attrs[k].value)
+                    ref = attrs[k]
                 if k.endswith(":id"):
-                    rId = str(attrs[k].value)
+                    rId = attrs[k]
             if not ref or not rId:
-                continue
-            rel = self.relationships.relationships.get(rId)
+                return
+            rel = relationships.get(rId)
             if not rel:
-                continue
-            target = rel.get('target')
-            for cell in self._range(ref):
-                self.hyperlinks[cell] = target
+                return
+            # a later hyperlink overrides an earlier one on the cells they share
+            link = (next(order), rel.get('target'))
+            if ":" not in ref:
+                cells[ref] = link
+            else:
+                rng = split_range_ref(ref)
+                if rng is not None:
+                    ranges.append(rng + link)
+
+        # the element is parsed on its own, so prefixes are left unresolved
+        parser = xml.parsers.expat.ParserCreate()
+        parser.StartElementHandler = handleStartElement
+        parser.Parse(data, True)
+        self.hyperlinkRanges = RangeIndex(ranges)
+
+    def _find_hyperlink(self, index):
+        # type: (int) -> Optional[str]
+        """Target of the hyperlink on the current cell, None if it has none"""
+        if not self.cellId:
+            return None
+        link = self.hyperlinks.get(self.cellId)
+        for rng in self.hyperlinkRanges.active:
+            if rng[2] <= index <= rng[3] and (link is None or rng[4] > link[0]):
+                link = rng[4:]
+        return link and link[1]
 
     def to_csv(self, writer):
         self.writer = writer
-        self.parser = xml.parsers.expat.ParserCreate()
-        self.parser.buffer_text = True
-        self.parser.CharacterDataHandler = self.handleCharData
-        self.parser.StartElementHandler = self.handleStartElement
-        self.parser.EndElementHandler = self.handleEndElement
-        if self.filedata:
-            self.parser.Parse(self.filedata)
+        self._build_formatters()
+        try:
+            self.parser.parse(self, self.filedata or self.filehandle)
+        except StopSheet:
+            pass
+        finally:
+            self._flush_rows()
+
+    def iter_row_batches(self, batch_size=ROW_BATCH_SIZE):
+        # type: (int) -> Iterator[List[List[str]]]
+        """
+         Yields the rows to_csv would write in lists of batch_size rows, the last one possibly shorter.
+         The parser runs a chunk at a time between batches, so only about a chunk worth of rows is held.
+        """
+        self.writer = None
+        self._build_formatters()
+        rows = []
+        for _ in self._parse_steps():
+            batch, self.rowBatch = self.rowBatch, []
+            for row in batch:
+                if isinstance(row, list):
+                    rows.append(row)
+                    if len(rows) >= batch_size:
+                        yield rows
+                        rows = []
+                    continue
+                # a run of empty rows, see _write_empty_rows
+                while row:
+                    count = min(row, batch_size - len(rows))
+                    rows.extend([] for _ in range(count))
+                    row -= count
+                    if len(rows) >= batch_size:
+                        yield rows
+                        rows = []
+        if rows:
+            yield rows
+
+    def _parse_steps(self):
+        """Runs the parser a chunk at a time like its iterparse, until the part ends or a handler raises StopSheet"""
+        try:
+            for _ in self.parser.iterparse(self, self.filedata or self.filehandle):
+                yield
+        except StopSheet:
+            yield
+
+    def _write_row(self, row):
+        if self.rowsLeft is not None:
+            if not self.rowsLeft:
+                return
+            self.rowsLeft -= 1
+        self.rowBatch.append(row)
+        if len(self.rowBatch) >= ROW_BATCH_SIZE:
+            self._flush_rows()
+
+    def _write_empty_rows(self, count):
+        if self.rowsLeft is not None:
+            count = min(count, self.rowsLeft)
+            self.rowsLeft -= count
+        if self.writer is None:
+            # iterated rows are handed out one list each, the run is expanded batch by batch
+            self.rowBatch.append(count)
+        elif len(self.rowBatch) + count <= ROW_BATCH_SIZE:
+            self.rowBatch.extend(itertools.repeat([], count))
         else:
-            self.parser.ParseFile(self.filehandle)
+            self._flush_rows()
+            self.writer.writerows(itertools.repeat([], count))
+
+    def _flush_rows(self):
+        if self.rowBatch and self.writer is not None:
+            self.writer.writerows(self.rowBatch)
+            self.rowBatch = []
 
     def handleCharData(self, data):
         if self.in_cell_value:
-            format_type = None
-            format_str = "general"
             self.data += data
-            if self.colType == "s":  # shared string
-                format_type = "string"
-                self.data = self.sharedStrings[int(data)]
-
-                # Handle cell string data that has \r\n by changing the value that expat uses for the \r to an empty string.
-                # This happens a lot with older versions of excel, and the character conversion is happening inside expat.
-                if self.data.find(XMLPARSER_WINDOWS_NEWLINE_STR) > -1:
-                    self.data = self.data.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n")
-            elif self.colType == "b":  # boolean
-                format_type = "boolean"
+
+    def _convert_value(self):
+        # the text of a value element may arrive in several handleCharData calls when the sheet is fed
+        # to the parser in chunks, so it is converted once the element ends
+        data = self.data
+        if self.colType == "s":  # shared string
+            self.data = self.sharedStrings[int(data)]
+
+            # Handle cell string data that has \r\n by changing the value that expat uses for the \r to an empty string.
+            # This happens a lot with older versions of excel, and the character conversion is happening inside expat.
+            if self.data.find(XMLPARSER_WINDOWS_NEWLINE_STR) > -1:
+                self.data = self.data.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n")
+        elif self.colType == "b":  # boolean
+            if self.typed_values and (data == "1" or data == "0"):
+                self.data = data == "1"
+            else:
                 self.data = (int(data) == 1 and "TRUE") or (int(data) == 0 and "FALSE") or data
-            elif self.colType == "str" or self.colType == "inlineStr":
-                format_type = "string"
-
-                # Again, check for the \r\n change and clear the apply hack
-                if data.find(XMLPARSER_WINDOWS_NEWLINE_STR) > -1:
-                    self.data = self.data.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n")
-            elif self.s_attr:
-                s = int(self.s_attr)
-
-                # get cell format
-                xfs_numfmt = None
-                if s < len(self.styles.cellXfs):
-                    xfs_numfmt = self.styles.cellXfs[s]
-                if xfs_numfmt in self.styles.numFmts:
-                    format_str = self.styles.numFmts[xfs_numfmt]
-                elif xfs_numfmt in STANDARD_FORMATS:
-                    format_str = STANDARD_FORMATS[xfs_numfmt]
-
-                # get format type
-                if not format_str:
-                    raise XlsxValueError("unknown format %s at %d" % (format_str, xfs_numfmt))
-
-                if format_str in FORMATS:
-                    format_type = FORMATS[format_str]
-                elif re.match(r"^\d+(\.\d+)?$", self.data) and re.match(".*[hsmdyY]", format_str) and not re.match(
-                        r".*\[.*[dmhys].*\]", format_str):
+        elif self.colType == "str" or self.colType == "inlineStr":
+            # Again, check for the \r\n change and clear the apply hack
+            if data.find(XMLPARSER_WINDOWS_NEWLINE_STR) > -1:
+                self.data = data.replace(XMLPARSER_WINDOWS_NEWLINE_STR, "\n")
+        elif self.s_attr:
+            s = int(self.s_attr)
+            if s < len(self.formatters):
+                self.data = self.formatters[s](data)
+            else:
+                self.data = self.general_formatter(data)
+        elif self.colType == "n" or (not self.colType and len(data) and (
+                data[0] >= '0' and data[0] <= '9' or self.typed_values)):
+            # default assumption for a cell without t attribute is that it is a number, when rendering text
+            # negative ones are left as they are since the text would be the same
+            self.data = self.general_formatter(data)
+
+    def _build_formatters(self):
+        # the same few thousand dates tend to repeat across a sheet, so rendered values are memoized
+        # by (serial value, pattern); date1904, dateformat and timeformat are fixed for the whole sheet
+        cache = functools.lru_cache(maxsize=self.date_cache_size)
+        self.render_date = cache(self._format_date)
+        self.render_time = cache(self._format_time)
+        self.date_value = cache(self._date_value)
+        self.time_value = cache(self._time_value)
+        self.formatters = [self._make_formatter(xfs_numfmt, format_str, format_type)
+                           for xfs_numfmt, format_str, format_type in self.styles.cellFormats]
+        self.general_formatter = self._make_formatter(None, "general", FORMATS["general"])
+
+    def _make_formatter(self, xfs_numfmt, format_str, format_type):
+        """Return a function that renders the raw value of a cell with the given number format"""
+        if not format_str:
+            def formatter(data):
+                raise XlsxValueError("unknown format %s at %d" % (format_str, xfs_numfmt))
+            return formatter
+
+        if format_type == 'date' and self.dateformat == 'float':
+            format_type = "float"
+        ignore_formats = self.ignore_formats
+        if self.typed_values:
+            match_scifloat = NUMBER_VALUE_RE.match
+            renderers = {
+                'date': self.date_value,
+                'time': self.time_value,
+                'float': number_value,
+                'percentage': number_value,
+            }
+        else:
+            match_scifloat = self.scifloat and SCIFLOAT_VALUE_RE.match
+            render_date = self.render_date
+            render_time = self.render_time
+            format_float = FloatFormat(format_str, self.floatformat).format
+            if self.dateformat:
+                date_pattern, strip = self.dateformat, False
+            elif format_type in ('date', 'datetime'):
+                date_pattern, strip = date_format_to_strftime(format_str), True
+            else:
+                date_pattern, strip = None, False
+            timeformat = self.timeformat
+            renderers = {
+                'date': lambda data: render_date(data, date_pattern, strip),
+                'time': lambda data: render_time(data, timeformat),
+                'float': format_float,
+            }
+
+        if format_type == "datetime":
+            def classify(data):
+                parts = split_decimal(data)
+                if (parts is not None and not parts[0]) or (parts is None and DATE_VALUE_RE.match(data)):
                     # it must be date format
-                    if float(self.data) < 1:
-                        format_type = "time"
-                    else:
-                        format_type = "date"
-                elif re.match(r"^-?\d+(.\d+)?$", self.data) or (
-                            self.scifloat and re.match(r"^-?\d+(.\d+)?([eE]-?\d+)?$", self.data)):
-                    format_type = "float"
-                if format_type == 'date' and self.dateformat == 'float':
-                    format_type = "float"
-            elif self.colType == "n":
-                format_type = "float"
-            elif not self.colType and len(self.data) and self.data[0] >= '0' and self.data[0] <= '9':
-                # default assumption for a cell without t attribute is that it is a number
-                format_type = "float"
-
-            if format_type and not format_type in self.ignore_formats and self.data not in EXCEL_ERROR_VALUES:
-                try:
-                    if format_type == 'date':  # date/time
-                        if self.workbook.date1904:
-                            date = datetime.datetime(1904, 1, 1) + datetime.timedelta(float(self.data))
-                        else:
-                            date = datetime.datetime(1899, 12, 30) + datetime.timedelta(float(self.data))
-                        if self.dateformat:
-                            # str(dateformat) - python2.5 bug, see: http://bugs.python.org/issue2782
-                            self.data = date.strftime(str(self.dateformat))
-                        else:
-                            # ignore ";@", don't know what does it mean right now
-                            # ignore "[$-409], [$-f409], [$-16001]" and similar format codes
-                            dateformat = re.sub(r"\[\$\-[A-z0-9]*\]", "", format_str, count=1) \
-                                .replace(";@", "").replace("yyyy", "%Y").replace("yy", "%y") \
-                                .replace("hh:mm", "%H:%M").replace("h", "%I").replace("%H%H", "%H") \
-                                .replace("ss", "%S").replace("dddd", "d").replace("dd", "d").replace("d", "%d") \
-                                .replace("am/pm", "%p").replace("mmmm", "%B").replace("mmm", "%b") \
-                                .replace(":mm", ":%M").replace("m", "%m").replace("%m%m", "%m")
-                            self.data = date.strftime(str(dateformat)).strip()
-                    elif format_type == 'time':  # time
-                        t = int(round((float(self.data) % 1) * 24 * 60 * 60, 6))  # it should be in seconds
-                        d = datetime.time(int((t // 3600) % 24), int((t // 60) % 60), int(t % 60))
-                        self.data = d.strftime(self.timeformat)
-                    elif format_type == 'float':
-                        data = float(self.data)
-                        if not self.floatformat and data.is_integer():
-                            # repr(float(...)) - workaround to correctly round precision for floats
-                            # repr gives same result on python 2 and 3, while str is different on python 2
-                            self.data = "%i" % Decimal(repr(float(self.data)))
-                        elif ('E' in self.data or 'e' in self.data) or self.floatformat:
-                            self.data = str(self.floatformat or '%f') % data
-                        # if cell is general, be aggressive about stripping any trailing 0s, decimal points, etc.
-                        elif format_str == 'general':
-                            self.data = ("%f" % data).rstrip('0').rstrip('.')
-                        elif format_str[0:3] == '0.0':
-                            if self.floatformat:
-                                self.data = str(self.floatformat) % data
-                            else:
-                                L = len(format_str.split(".")[1])
-                                if '%' in format_str:
-                                    L += 1
-                                self.data = ("%." + str(L) + "f") % data
-                        else:
-                            # unsupported float formatting
-                            self.data = ("%f" % data).rstrip('0').rstrip('.')
-
-                except (ValueError, OverflowError):  # this catch must be removed, it's hiding potential problems
-                    if self.options['ignore_invalid_char_data']:
-                        # If invalid character data or excel formulas are encountered,
-                        # we set the data to empty string to avoid conversion errors
-                        self.data = ""
-                    else:
-                        raise XlsxValueError("Error: potential invalid date format.")
+                    if float(data) < 1:
+                        return "time"
+                    elif self.dateformat == 'float':
+                        return "float"
+                    return "date"
+                elif parts is not None or FLOAT_VALUE_RE.match(data) or (match_scifloat and match_scifloat(data)):
+                    return "float"
+                return None
+        elif format_type is None:
+            def classify(data):
+                if split_decimal(data) is not None or FLOAT_VALUE_RE.match(data) or (
+                        match_scifloat and match_scifloat(data)):
+                    return "float"
+                return None
+        elif format_type in ignore_formats or format_type not in renderers:
+            return lambda data: data
+        else:
+            render = renderers[format_type]
+
+            def formatter(data):
+                if data in EXCEL_ERROR_VALUES:
+                    return data
+                return self._render(render, data)
+            return formatter
+
+        def formatter(data):
+            format_type = classify(data)
+            if not format_type or format_type in ignore_formats or data in EXCEL_ERROR_VALUES:
+                return data
+            return self._render(renderers[format_type], data)
+        return formatter
+
+    def _render(self, render, data):
+        try:
+            return render(data)
+        except (ValueError, OverflowError):  # this catch must be removed, it's hiding potential problems
+            if self.ignore_invalid_char_data:
+                # If invalid character data or excel formulas are encountered,
+                # we set the data to empty string to avoid conversion errors
+                return ""
+            raise XlsxValueError("Error: potential invalid date format.")
+
+    def _date_value(self, data):
+        if self.workbook.date1904:
+            return datetime.datetime(1904, 1, 1) + datetime.timedelta(float(data))
+        return datetime.datetime(1899, 12, 30) + datetime.timedelta(float(data))
+
+    def _time_value(self, data):
+        t = int(round((float(data) % 1) * 24 * 60 * 60, 6))  # it should be in seconds
+        return datetime.time(int((t // 3600) % 24), int((t // 60) % 60), int(t % 60))
+
+    def _format_date(self, data, pattern, strip):
+        date = self._date_value(data)
+        if strip:
+            return date.strftime(pattern).strip()
+        return date.strftime(pattern)
+
+    def _format_time(self, data, timeformat):
+        return self._time_value(data).strftime(timeformat)
 
     def handleStartElement(self, name, attrs):
-        has_namespace = name.find(":") > 0
-        if self.in_row and (name == 'c' or (has_namespace and name.endswith(':c'))):
-            self.colType = attrs.get("t")
-            self.s_attr = attrs.get("s")
+        handler = self.startHandlers[name]
+        if handler is not None:
+            handler(attrs)
+
+    def handleEndElement(self, name):
+        handler = self.endHandlers[name]
+        if handler is not None:
+            handler()
+
+    def handleStartCell(self, attrs):
+        if self.in_row:
             self.cellId = attrs.get("r")
             if self.cellId:
-                self.colNum = self.cellId[:len(self.cellId) - len(self.rowNum)]
+                self.colNum, self.colStart, _ = split_cell_ref(self.cellId)
                 self.colIndex = 0
             else:
                 self.colIndex += 1
+            if self.projection is not None:
+                index = self.colStart + self.colIndex
+                # merge anchors are still converted for the covered cells in the projection
+                if index not in self.projection and index not in self.filterColumns and \
+                        not (self.mergeRanges.active and self._is_merge_anchor(index)):
+                    # a row of skipped cells is still written, as an empty row of the projection
+                    self.rowWidth = self.rowWidth or 1
+                    return
+            self.colType = attrs.get("t")
+            self.s_attr = attrs.get("s")
             self.data = ""
             self.in_cell = True
-        elif self.in_cell and ((name == 'v' or name == 't') or (has_namespace and name.endswith(':v'))):
+
+    def handleStartValue(self, attrs):
+        if self.in_cell:
             self.in_cell_value = True
-        elif self.in_sheet and (name == 'row' or (has_namespace and name.endswith(':row'))) and ('r' in attrs) and not (self.skip_hidden_rows and 'hidden' in attrs and attrs['hidden'] == '1'):
+
+    def handleStartRow(self, attrs):
+        if self.in_sheet and ('r' in attrs) and not (self.skip_hidden_rows and 'hidden' in attrs and attrs['hidden'] == '1'):
             self.rowNum = attrs['r']
+            self.rowIndex = int(self.rowNum)
+            if self.lastRow is not None and self.rowIndex > self.lastRow:
+                # the sheet goes on, so the missing rows at the end of the range are empty lines as usual
+                if not self.skip_empty_lines and self.rowFilter is None and self.lastRow > self.lastRowNum:
+                    self._write_empty_rows(self.lastRow - self.lastRowNum)
+                raise StopSheet()
+            if self.rowIndex < self.firstRow and not self.mergeRanges and self.columnNames is None:
+                return
             self.in_row = True
             self.colIndex = 0
             self.colNum = ""
-            self.columns = {}
+            self.colStart = -1
+            if len(self.blankRow) != self.columns_count and self.columns_count > 0:
+                self.blankRow = [""] * self.columns_count
+            self.rowValues = self.blankRow[:]
+            self.rowWidth = 0
             self.spans = None
             if 'spans' in attrs:
                 self.spans = [int(i) for i in attrs['spans'].split(" ")[-1].split(":")]
-
-        elif name == 'sheetData' or (has_namespace and name.endswith(':sheetData')):
-            self.in_sheet = True
-        elif name == 'dimension':
-            rng = attrs.get("ref").split(":")
-            if len(rng) > 1:
-                start = re.match(r"^([A-Z]+)(\d+)$", rng[0])
-                if (start):
-                    end = re.match(r"^([A-Z]+)(\d+)$", rng[1])
-                    startCol = start.group(1)
-                    endCol = end.group(1)
-                    self.columns_count = 0
-                    for cell in self._range(startCol + "1:" + endCol + "1"):
-                        self.columns_count += 1
-
-    def handleEndElement(self, name):
-        has_namespace = name.find(":") > 0
-        if self.in_cell and ((name == 'v' or name == 't') or (has_namespace and name.endswith(':v'))):
+            if self.hyperlinkRanges:
+                self.hyperlinkRanges.advance(self.rowIndex)
+            if self.mergeRanges and self.mergeRanges.advance(self.rowIndex):
+                active = self.mergeRanges.active
+                self.mergeLefts = [rng[2] for rng in active]
+                keys = set((rng[0], rng[2]) for rng in active)
+                for key in [key for key in self.mergeValues if key not in keys]:
+                    del self.mergeValues[key]
+
+    def handleStartSheetData(self, attrs):
+        self.in_sheet = True
+
+    def handleDimension(self, attrs):
+        rng = attrs.get("ref").split(":")
+        if len(rng) > 1 and self.projection is None:
+            start = re.match(r"^([A-Z]+)(\d+)$", rng[0])
+            if (start):
+                end = re.match(r"^([A-Z]+)(\d+)$", rng[1])
+                self.columns_count = column_index(end.group(1)) - column_index(start.group(1)) + 1
+        elif len(rng) > 1:
+            end = re.match(r"^([A-Z]+)(\d+)$", rng[1])
+            count = len(self.projection)
+            if end and column_index(end.group(1)) < count and \
+                    all(self.projection.get(i) == i for i in range(count)):
+                # the projection keeps every column of the sheet in place, so cells are placed unprojected,
+                # rows still count columns_count columns and any cell past the dimension is dropped
+                self.projection = None
+                self.columnLimit = count
+
+    def handleEndValue(self):
+        if self.in_cell:
             self.in_cell_value = False
-        elif self.in_cell and (name == 'c' or (has_namespace and name.endswith(':c'))):
-            t = 0
-            for i in self.colNum: t = t * 26 + ord(i) - 64
-            d = self.data
-            if self.hyperlinks:
-                hyperlink = self.hyperlinks.get(self.cellId)
-                if hyperlink:
-                    d = "<a href='" + hyperlink + "'>" + d + "</a>"
-            if self.colNum + self.rowNum in self.mergeCells.keys():
-                if 'copyFrom' in self.mergeCells[self.colNum + self.rowNum].keys() and \
-                                self.mergeCells[self.colNum + self.rowNum]['copyFrom'] == self.colNum + self.rowNum:
-                    self.mergeCells[self.colNum + self.rowNum]['value'] = d
-                else:
-                    d = self.mergeCells[self.mergeCells[self.colNum + self.rowNum]['copyFrom']]['value']
-
-            if self.no_line_breaks:
-              d = d.replace("\r", " ").replace("\n", " ").replace("\t", " ")
-
-            self.columns[t - 1 + self.colIndex] = d
+            if self.data and self.rowFilter is None:
+                self._convert_value()
+
+    def handleEndCell(self):
+        if self.in_cell:
+            index = self.colStart + self.colIndex
+            if self.rowFilter is None:
+                self._place_cell(index)
+            else:
+                # converted once the row passes, see _filter_row
+                self.rowCells.append((index, self.cellId, self.colType, self.s_attr, self.data))
             self.in_cell = False
 
-        if self.in_row and (name == 'row' or (has_namespace and name.endswith(':row'))):
-            if len(self.columns.keys()) > 0:
-                if min(self.columns.keys()) < 0: # Weird
-                    d = []
-                    keys = self.columns.keys()
-                    keys.sort()
-                    for k in keys:
-                        val = self.columns[k]
-                        if not self.py3:
-                            val = val.encode("utf-8")
-                        d.append(val)
+    def _place_cell(self, index):
+        d = self.data
+        # shared strings come escaped or with line breaks replaced already, see Xlsx2csv._prepare_shared_strings
+        if self.escape_strings and (self.colType == "str" or self.colType == "inlineStr"):
+            d = d.translate(ESCAPE_TABLE)
+        hyperlink = None
+        if self.hyperlinks or self.hyperlinkRanges.active:
+            hyperlink = self._find_hyperlink(index)
+            if hyperlink:
+                d = "<a href='" + hyperlink + "'>" + str(d) + "</a>"
+        if self.no_line_breaks and (self.colType != "s" or hyperlink) and isinstance(d, str):
+            d = d.translate(LINE_BREAK_TABLE)
+        if self.mergeRanges.active:
+            active = self.mergeRanges.active
+            i = bisect.bisect_right(self.mergeLefts, index) - 1
+            if i >= 0 and index <= active[i][3]:
+                top, _, left, _ = active[i]
+                if self.rowIndex == top and index == left:
+                    self.mergeValues[(top, left)] = d
                 else:
-                    d = [""] * (max(self.columns_count, max(self.columns.keys()) + 1))
-                    for k in self.columns.keys():
-                        val = self.columns[k]
-                        if not self.py3:
-                            val = val.encode("utf-8")
-                        d[k] = val
-                if self.spans:
-                    l = self.spans[1]
-                    if len(d) < l:
-                        d += (l - len(d)) * ['']
+                    # covered cells take the value of the top left cell, empty if it has none
+                    d = self.mergeValues.get((top, left), "")
+
+        if self.projection is not None:
+            index = self.projection.get(index, -1)
+        if index >= 0:  # a cell reference without a column can't be placed
+            values = self.rowValues
+            if index >= len(values):
+                if index >= self.columnLimit:
+                    self.rowWidth = self.rowWidth or 1
+                    return
+                values.extend([""] * (index + 1 - len(values)))
+            values[index] = d
+            if index >= self.rowWidth:
+                self.rowWidth = index + 1
+
+    def handleEndRow(self):
+        if self.in_row:
+            if self.rowIndex < self.firstRow:
+                # converted only for the merge anchors of cells in the wanted rows it may hold, or for the
+                # column names, which are looked up in the first row with cells even before the range
+                if self.rowCells:
+                    self._place_row_cells(self.columnNames is not None)
+                if self.columnNames is not None and self.rowWidth > 0:
+                    self._resolve_column_names(self.rowValues)
+                self.in_row = False
+                return
+            if self.rowFilter is not None and not self._filter_row():
+                self.in_row = False
+                if self.rowIndex == self.lastRow:
+                    raise StopSheet()
+                return
+            if self.rowWidth > 0:
+                # the buffer is at least columns_count long and covers every placed cell
+                d = self.rowValues
+                if self.columnNames is not None:
+                    d = self._resolve_column_names(d)
+                elif self.spans and self.projection is None and len(d) < min(self.spans[1], self.columnLimit):
+                    d.extend([""] * (min(self.spans[1], self.columnLimit) - len(d)))
                 if self.columns_count < 0:
                     self.columns_count = len(d)
 
                 # write empty lines
-                if not self.skip_empty_lines:
-                    for i in range(self.lastRowNum, int(self.rowNum) - 1):
-                        self.writer.writerow([])
-                    self.lastRowNum = int(self.rowNum)
+                if not self.skip_empty_lines and self.rowFilter is None:
+                    if self.rowIndex - 1 > self.lastRowNum:
+                        self._write_empty_rows(self.rowIndex - 1 - self.lastRowNum)
+                    self.lastRowNum = self.rowIndex
 
                 # write line to csv
-                if not self.skip_empty_lines or d.count('') != len(d):
-                    while len(d) < self.columns_count:
-                        d.append("")
-
+                # typed values like 0 and False are falsy but not empty
+                if not self.skip_empty_lines or any(d) or (self.typed_values and d.count("") < len(d)):
                     if self.skip_trailing_columns:
                         if self.max_columns < 0:
-                            self.max_columns = len(d)
-                            while len(d) > 0 and d[-1] == "":
-                                d = d[0:-1]
-                                self.max_columns = self.max_columns - 1
+                            n = len(d)
+                            while n > 0 and d[n - 1] == "":
+                                n -= 1
+                            del d[n:]
+                            self.max_columns = n
                         elif self.max_columns > 0:
-                            d = d[0:self.max_columns]
-                    self.writer.writerow(d)
+                            del d[self.max_columns:]
+                    self._write_row(d)
 
             self.in_row = False
-        elif self.in_sheet and (name == 'sheetData' or (has_namespace and name.endswith(':sheetData'))):
-            self.in_sheet = False
+            if self.rowsLeft == 0 or self.rowIndex == self.lastRow:
+                raise StopSheet()
 
-    # rangeStr: "A3:C12" or "D5"
-    # example: for cell in _range("A1:Z12"): print cell
-    def _range(self, rangeStr):
-        rng = rangeStr.split(":")
-        if len(rng) == 1:
-            yield rangeStr
-        else:
-            start = re.match(r"^([A-Z]+)(\d+)$", rng[0])
-            end = re.match(r"^([A-Z]+)(\d+)$", rng[1])
-            if not start or not end:
-                return
-            startCol = start.group(1)
-            startRow = int(start.group(2))
-            endCol = end.group(1)
-            endRow = int(end.group(2))
-            col = startCol
-            while True:
-                for row in range(startRow, endRow + 1):
-                    yield col + str(row)
-                if col == endCol:
-                    break
-                t = 0
-                for i in col: t = t * 26 + ord(i) - 64
-                col = ""
-                while t >= 0:
-                    col = chr(t % 26 + 65) + col
-                    t = t // 26 - 1
+    def handleEndSheetData(self):
+        if self.in_sheet:
+            self.in_sheet = False
 
 
 def convert_recursive(path, sheetid, outfile, kwargs, continue_on_error=False):
@@ -1148,29 +2657,24 @@ def convert_recursive(path, sheetid, outfile, kwargs, continue_on_error=False):
 
 
 def main():
+    if sys.argv[1:] in (["-v"], ["--version"]):
+        # answered before the option parser is built
+        sys.stdout.write(__version__ + "\n")
+        return
+
+    import signal
+    from argparse import ArgumentParser
+
     try:
         signal.signal(signal.SIGPIPE, signal.SIG_DFL)
         signal.signal(signal.SIGINT, signal.SIG_DFL)
     except AttributeError:
         pass
 
-    if "ArgumentParser" in globals():
-        parser = ArgumentParser(description="xlsx to csv converter")
-        parser.add_argument('infile', metavar='xlsxfile', help="xlsx file path, use '-' to read from STDIN")
-        parser.add_argument('outfile', metavar='outfile', nargs='?', help="output CSV file path")
-        parser.add_argument('-v', '--version', action='version', version=__version__)
-        nargs_plus = "+"
-        argparser = True
-    else:
-        parser = OptionParser(usage="%prog [options] infile [outfile]", version=__version__)
-        parser.add_argument = parser.add_option
-        nargs_plus = 1
-        argparser = False
-
-    if sys.version_info[0] == 2 and sys.version_info[1] < 5:
-        inttype = "int"
-    else:
-        inttype = int
+    parser = ArgumentParser(description="xlsx to csv converter")
+    parser.add_argument('infile', metavar='xlsxfile', help="xlsx file path, use '-' to read from STDIN")
+    parser.add_argument('outfile', metavar='outfile', nargs='?', help="output CSV file path")
+    parser.add_argument('-v', '--version', action='version', version=__version__)
     parser.add_argument("-a", "--all", dest="all", default=False, action="store_true",
                         help="export all sheets")
     parser.add_argument("-c", "--outputencoding", dest="outputencoding", default="utf-8", action="store",
@@ -1183,7 +2687,7 @@ def main():
                         help="escape \\r\\n\\t characters")
     parser.add_argument("--no-line-breaks", "--no-line-breaks", dest='no_line_breaks', default=False, action="store_true",
                         help="replace \\r\\n\\t with space")
-    parser.add_argument("-E", "--exclude_sheet_pattern", nargs=nargs_plus, dest="exclude_sheet_pattern", default="",
+    parser.add_argument("-E", "--exclude_sheet_pattern", nargs="+", dest="exclude_sheet_pattern", default="",
                         help="exclude sheets with names matching the given pattern, only affects when -a option is enabled.")
     parser.add_argument("-f", "--dateformat", dest="dateformat",
                         help="override date/time format (ex. %%Y/%%m/%%d)")
@@ -1193,11 +2697,11 @@ def main():
                         help="override float format (ex. %%.15f)")
     parser.add_argument("--sci-float", dest="scifloat", default=False, action="store_true",
                         help="force scientific notation to float")
-    parser.add_argument("-I", "--include_sheet_pattern", nargs=nargs_plus, dest="include_sheet_pattern", default="^.*$",
+    parser.add_argument("-I", "--include_sheet_pattern", nargs="+", dest="include_sheet_pattern", default="^.*$",
                         help="only include sheets with names matching the given pattern, only affects when -a option is enabled.")
     parser.add_argument("--exclude_hidden_sheets", default=False, action="store_true",
                         help="exclude hidden sheets from the output, only affects when -a option is enabled.")
-    parser.add_argument("--ignore-formats", nargs=nargs_plus, type=str, dest="ignore_formats", default=[''],
+    parser.add_argument("--ignore-formats", nargs="+", type=str, dest="ignore_formats", default=[''],
                         help="ignore format for specific data types")
     parser.add_argument("-l", "--lineterminator", dest="lineterminator", default="\n",
                         help="line terminator - line terminator in CSV, '\\n' '\\r\\n' or '\\r' (default: \\n)")
@@ -1214,22 +2718,48 @@ def main():
                              "or '\\f' for form feed (default: '--------')")
     parser.add_argument("-q", "--quoting", dest="quoting", default="minimal",
                         help="quoting - field quoting in CSV, 'none' 'minimal' 'nonnumeric' or 'all' (default: minimal)")
-    parser.add_argument("-s", "--sheet", dest="sheetid", default=1, type=inttype,
+    parser.add_argument("-s", "--sheet", dest="sheetid", default=1, type=int,
                         help="sheet number to convert")
     parser.add_argument("--include-hidden-rows", dest="include_hidden_rows", default=False, action="store_true",
                         help="include hidden rows")
     parser.add_argument("--continue-on-error", dest="continue_on_error", default=False, action="store_true",
                         help="continue processing remaining files when an error occurs during batch processing")
-
-    if argparser:
-        options = parser.parse_args()
-    else:
-        (options, args) = parser.parse_args()
-        if len(args) < 1:
-            parser.print_usage()
-            sys.exit("error: too few arguments" + os.linesep)
-        options.infile = args[0]
-        options.outfile = len(args) > 1 and args[1] or None
+    parser.add_argument("--output-buffer-size", dest="output_buffer_size", default=None, type=int,
+                        help="output buffer size in bytes, larger buffers mean fewer writes to pipes and network "
+                             "filesystems (default: python's default)")
+    parser.add_argument("--parser", dest="parser", default="expat", choices=sorted(PARSERS),
+                        help="xml parser backend, lxml needs the lxml package (default: expat)")
+    parser.add_argument("--compact-shared-strings", dest="compact_shared_strings", default=False, action="store_true",
+                        help="keep shared strings in a compact buffer, lowers memory use for workbooks with "
+                             "millions of unique strings at some cost in speed")
+    parser.add_argument("--mmap-shared-strings", dest="mmap_shared_strings", default=False, action="store_true",
+                        help="stream shared strings into a temporary on-disk index instead of memory, "
+                             "for shared strings parts too large to load")
+    parser.add_argument("--selective-shared-strings", dest="selective_shared_strings", default=False,
+                        action="store_true",
+                        help="scan the sheet first and load only the shared strings it uses, faster for "
+                             "single sheets of large multi-sheet workbooks")
+    parser.add_argument("--metadata-cache", dest="metadata_cache", default=None,
+                        help="directory to cache parsed workbook metadata in, converting the same workbook again "
+                             "skips parsing shared strings, styles and the workbook")
+    parser.add_argument("--rows", dest="rows", default=None,
+                        help="convert only the rows numbered START to END, e.g. '100:200', '100:' or ':200'; "
+                             "reading stops after END")
+    parser.add_argument("--head", dest="head", default=None, type=int,
+                        help="convert only the first HEAD rows, reading stops after them")
+    parser.add_argument("--where", dest="where", action="append", default=None,
+                        help="convert only the rows meeting this condition on the raw cell value, like 'D=KR', "
+                             "'E>=100' or \"F!='n/a'\" with = != < <= > >=, may be repeated to require several")
+    parser.add_argument("--columns", dest="columns", default=None,
+                        help="convert only these columns, in this order, e.g. 'A,C,F:H'; columns A to XFD, "
+                             "each listed at most once")
+    parser.add_argument("--column-names", nargs="+", dest="column_names", default=None,
+                        help="convert only the columns with these names in the first row, after those of --columns")
+    parser.add_argument("--typed-values", dest="typed_values", default=False, action="store_true",
+                        help="write numbers, dates, times and booleans unformatted as python values, with "
+                             "-q nonnumeric only text is quoted; date, time and float formats are ignored")
+
+    options = parser.parse_args()
 
     if len(options.delimiter) == 1:
         pass
@@ -1297,7 +2827,19 @@ def main():
         'outputencoding': options.outputencoding,
         'lineterminator': options.lineterminator,
         'ignore_formats': options.ignore_formats,
-        'skip_hidden_rows': not options.include_hidden_rows
+        'skip_hidden_rows': not options.include_hidden_rows,
+        'output_buffer_size': options.output_buffer_size,
+        'parser': options.parser,
+        'compact_shared_strings': options.compact_shared_strings,
+        'mmap_shared_strings': options.mmap_shared_strings,
+        'metadata_cache': options.metadata_cache,
+        'selective_shared_strings': options.selective_shared_strings,
+        'typed_values': options.typed_values,
+        'rows': options.rows,
+        'head': options.head,
+        'where': options.where,
+        'columns': options.columns,
+        'column_names': options.column_names
     }
     sheetid = options.sheetid
     if options.all:
@@ -1315,7 +2857,12 @@ def main():
                     sheetid = xlsx2csv.getSheetIdByName(options.sheetname)
                     if not sheetid:
                         sys.exit("Sheet '%s' not found" % options.sheetname)
-                xlsx2csv.convert(outfile, sheetid)
+                if outfile is sys.stdout and options.output_buffer_size:
+                    with open(sys.stdout.fileno(), "w", buffering=options.output_buffer_size,
+                              encoding=sys.stdout.encoding, errors=sys.stdout.errors, closefd=False) as stdout:
+                        xlsx2csv.convert(stdout, sheetid)
+                else:
+                    xlsx2csv.convert(outfile, sheetid)
     except XlsxException:
         _, e, _ = sys.exc_info()
         sys.exit(str(e) + "\n")
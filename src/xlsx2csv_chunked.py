@@ -7,12 +7,11 @@ xlsx2csv 청크 기반 병렬 처리 버전
 
 import os
 import sys
-import zipfile
 import xml.sax
 import time
 import tempfile
 from multiprocessing import Pool, cpu_count
-from xlsx2csv import Xlsx2csv, Sheet
+from xlsx2csv import Xlsx2csv, Sheet, SheetNotFoundException, StopSheet, column_index, parse_rows
 
 class ChunkedSheetParser(xml.sax.ContentHandler):
     """특정 행 범위만 처리하는 SAX 파서"""
@@ -48,6 +47,9 @@ class ChunkedSheetParser(xml.sax.ContentHandler):
             self.in_row = True
             self.current_row = []
             self.current_row_num = int(attrs.get('r', '0'))
+            if self.current_row_num > self.end_row:
+                # 범위를 지났으면 나머지 시트는 읽지 않음
+                raise StopSheet()
         elif name == 'c' and self.in_row:
             # 행 범위 체크
             if self.include_header and self.current_row_num == 1:
@@ -82,6 +84,9 @@ class ChunkedSheetParser(xml.sax.ContentHandler):
                 self.rows_data.append(self.current_row[:])
             elif self.start_row <= self.current_row_num <= self.end_row:
                 self.rows_data.append(self.current_row[:])
+            if self.current_row_num >= self.end_row:
+                # 마지막 행까지 처리했으면 압축 해제와 파싱을 중단
+                raise StopSheet()
         elif name == 'c' and self.in_cell:
             self.in_cell = False
             if self.current_cell:
@@ -97,18 +102,28 @@ class ChunkedSheetParser(xml.sax.ContentHandler):
             self.current_cell['value'] += content
 
 
-def get_sheet_dimensions(xlsx_file, sheet_index=1):
+def get_sheet_dimensions(xlsx_file, sheet_index=1, xlsx2csv=None):
     """
     시트의 차원(행 수, 열 수) 파악
     
+    Args:
+        xlsx_file: xlsx 파일 경로
+        sheet_index: 시트 인덱스 (1-based)
+        xlsx2csv: 재사용할 Xlsx2csv 인스턴스 (None이면 새로 열고 닫음)
+    
     Returns:
         (max_row, max_col) 튜플
     """
-    with zipfile.ZipFile(xlsx_file) as zf:
-        # sheet 파일 찾기
-        sheet_file = f'xl/worksheets/sheet{sheet_index}.xml'
+    owner = xlsx2csv is None
+    if owner:
+        xlsx2csv = Xlsx2csv(xlsx_file)
+    try:
+        # 워크북 관계 정보로 시트 파트 찾기
+        sheet_file = xlsx2csv.open_part(xlsx2csv.get_sheet_path(sheet_index))
+        if sheet_file is None:
+            raise SheetNotFoundException("Sheet %i not found" % sheet_index)
         
-        with zf.open(sheet_file) as f:
+        with sheet_file as f:
             # dimension 태그 찾기
             content = f.read(10000).decode('utf-8')  # 처음 일부만 읽기
             
@@ -121,15 +136,16 @@ def get_sheet_dimensions(xlsx_file, sheet_index=1):
                     max_row = int(match.group(2))
                     
                     # 열 문자를 숫자로 변환 (A=1, B=2, ..., AA=27)
-                    max_col = 0
-                    for char in col_letter:
-                        max_col = max_col * 26 + (ord(char) - ord('A') + 1)
+                    max_col = column_index(col_letter) + 1
                     
                     return max_row, max_col
             
             # dimension이 없으면 전체 스캔 (느림)
             # 단순화를 위해 기본값 반환
             return None, None
+    finally:
+        if owner:
+            xlsx2csv.close()
 
 
 def process_chunk(args):
@@ -148,39 +164,42 @@ def process_chunk(args):
         # Xlsx2csv 인스턴스 생성
         xlsx2csv = Xlsx2csv(xlsx_file, **options)
         
-        # ZIP 파일 열기
-        with zipfile.ZipFile(xlsx_file) as zf:
-            sheet_file = f'xl/worksheets/sheet{sheet_index}.xml'
-            
-            with zf.open(sheet_file) as sheet_filehandle:
-                # 청크 파서로 처리
-                parser = ChunkedSheetParser(xlsx2csv, start_row, end_row, include_header)
+        # 시트 파트 열기 (Xlsx2csv 가 연 ZIP 을 재사용)
+        sheet_file = xlsx2csv.open_part(xlsx2csv.get_sheet_path(sheet_index))
+        if sheet_file is None:
+            raise SheetNotFoundException("Sheet %i not found" % sheet_index)
+        with sheet_file as sheet_filehandle:
+            # 청크 파서로 처리
+            parser = ChunkedSheetParser(xlsx2csv, start_row, end_row, include_header)
+            try:
                 xml.sax.parse(sheet_filehandle, parser)
+            except StopSheet:
+                pass
+            
+            # CSV로 저장
+            with open(chunk_output_file, 'w', encoding='utf-8', newline='') as out:
+                import csv
+                writer = csv.writer(out, delimiter=options.get('delimiter', ','))
                 
-                # CSV로 저장
-                with open(chunk_output_file, 'w', encoding='utf-8', newline='') as out:
-                    import csv
-                    writer = csv.writer(out, delimiter=options.get('delimiter', ','))
-                    
-                    # 각 행 처리
-                    for row_cells in parser.rows_data:
-                        row_data = []
-                        for cell in row_cells:
-                            # 셀 값 변환 (shared_strings, 숫자 등)
-                            value = cell['value']
-                            cell_type = cell.get('t', '')
-                            
-                            if cell_type == 's':  # shared string
-                                try:
-                                    idx = int(value)
-                                    if idx < len(xlsx2csv.shared_strings.strings):
-                                        value = xlsx2csv.shared_strings.strings[idx]
-                                except:
-                                    pass
-                            
-                            row_data.append(value)
+                # 각 행 처리
+                for row_cells in parser.rows_data:
+                    row_data = []
+                    for cell in row_cells:
+                        # 셀 값 변환 (shared_strings, 숫자 등)
+                        value = cell['value']
+                        cell_type = cell.get('t', '')
+                        
+                        if cell_type == 's':  # shared string
+                            try:
+                                idx = int(value)
+                                if idx < len(xlsx2csv.shared_strings.strings):
+                                    value = xlsx2csv.shared_strings.strings[idx]
+                            except:
+                                pass
                         
-                        writer.writerow(row_data)
+                        row_data.append(value)
+                    
+                    writer.writerow(row_data)
         
         return (chunk_output_file, True, None)
     
@@ -256,14 +275,28 @@ class Xlsx2csvChunked:
         print(f"   - 총 행 수: {max_row:,}")
         print(f"   - 총 열 수: {max_col}")
         
+        # 행 범위 옵션 (rows / head) 반영: 범위 밖의 청크는 만들지 않음
+        first_row, last_row = parse_rows(self.options['rows']) if self.options.get('rows') else (1, None)
+        data_start = max(2, first_row)  # 1은 헤더
+        head = self.options.get('head')
+        if head is not None:
+            # 항상 쓰는 헤더도 HEAD 에 포함되므로 데이터 행은 head - 1 개까지
+            head_last = data_start + head - 2
+            last_row = head_last if last_row is None else min(last_row, head_last)
+        if last_row is not None:
+            max_row = min(max_row, last_row)
+        
         # 2. 청크 범위 계산
         print("\n2. 청크 분할 중...")
         ranges = []
-        start = 2  # 1은 헤더
+        start = data_start
         while start <= max_row:
             end = min(start + chunk_size - 1, max_row)
             ranges.append((start, end))
             start = end + 1
+        if not ranges and head != 0:
+            # 범위 안에 데이터 행이 없으면 (예: head=1) 헤더만 쓰는 청크
+            ranges.append((1, 1))
         
         num_chunks = len(ranges)
         print(f"   - 청크 수: {num_chunks}")
@@ -340,12 +373,16 @@ def main():
     parser.add_argument('--chunk-size', type=int, default=50000, help='청크 크기 (기본: 50000)')
     parser.add_argument('--workers', type=int, default=None, help='워커 수 (기본: CPU 수)')
     parser.add_argument('--delimiter', default=',', help='CSV 구분자 (기본: ,)')
+    parser.add_argument('--rows', default=None, help="변환할 행 범위 START:END (헤더 행은 항상 포함)")
+    parser.add_argument('--head', type=int, default=None, help='헤더 포함 처음 HEAD 행만 변환')
     
     args = parser.parse_args()
     
     converter = Xlsx2csvChunked(
         args.input_file,
-        delimiter=args.delimiter
+        delimiter=args.delimiter,
+        rows=args.rows,
+        head=args.head
     )
     
     converter.convert_chunked(
@@ -10,7 +10,6 @@ xlsx2csv 하이브리드 적응형 최적화 시스템
 """
 
 import os
-import zipfile
 import time
 from multiprocessing import cpu_count
 from xlsx2csv import Xlsx2csv
@@ -46,38 +45,34 @@ class FileAnalyzer:
         sheets_info = []
         total_rows = 0
         
-        with zipfile.ZipFile(self.xlsx_file) as zf:
-            # 시트 목록 확인
-            sheet_index = 1
-            while True:
-                sheet_file = f'xl/worksheets/sheet{sheet_index}.xml'
-                try:
-                    # dimension 파악
-                    max_row, max_col = get_sheet_dimensions(self.xlsx_file, sheet_index)
-                    
-                    if max_row is None:
-                        # dimension이 없으면 추정
-                        info = zf.getinfo(sheet_file)
-                        # 파일 크기로 대략적 행 수 추정 (1행 ≈ 150 bytes)
-                        max_row = info.file_size // 150
-                        max_col = 10
-                    
-                    sheets_info.append({
-                        'index': sheet_index,
-                        'name': f'Sheet{sheet_index}',
-                        'rows': max_row,
-                        'cols': max_col
-                    })
-                    
-                    total_rows += max_row
-                    
-                    print(f"  Sheet {sheet_index}: {max_row:,}행 × {max_col}열")
-                    
-                    sheet_index += 1
-                    
-                except KeyError:
-                    # 더 이상 시트 없음
-                    break
+        with Xlsx2csv(self.xlsx_file) as xlsx2csv:
+            # 워크북에 등록된 시트 목록 확인 (파트가 없는 시트는 건너뜀)
+            for sheet in sorted(xlsx2csv.workbook.sheets, key=lambda s: s['index']):
+                sheet_index = sheet['index']
+                sheet_file = xlsx2csv.resolve_part(xlsx2csv.get_sheet_path(sheet_index))
+                if sheet_file is None:
+                    continue
+                
+                # dimension 파악 (같은 ZIP 핸들 재사용)
+                max_row, max_col = get_sheet_dimensions(self.xlsx_file, sheet_index, xlsx2csv)
+                
+                if max_row is None:
+                    # dimension이 없으면 추정
+                    info = xlsx2csv.ziphandle.getinfo(sheet_file)
+                    # 파일 크기로 대략적 행 수 추정 (1행 ≈ 150 bytes)
+                    max_row = info.file_size // 150
+                    max_col = 10
+                
+                sheets_info.append({
+                    'index': sheet_index,
+                    'name': f'Sheet{sheet_index}',
+                    'rows': max_row,
+                    'cols': max_col
+                })
+                
+                total_rows += max_row
+                
+                print(f"  Sheet {sheet_index}: {max_row:,}행 × {max_col}열")
         
         num_sheets = len(sheets_info)
         
@@ -280,9 +275,9 @@ class Xlsx2csvHybrid:
         """시트 병렬 처리 실행"""
         print(f"⚡ 시트 병렬 처리 실행 중 ({config['num_workers']} 워커)...\n")
         
-        converter = Xlsx2csvParallel(self.xlsx_file, **self.options)
         # xlsx2csv_parallel은 자동으로 CPU 수만큼 워커 사용
-        converter.convert_parallel(output_dir, verbose=True)
+        with Xlsx2csvParallel(self.xlsx_file, **self.options) as converter:
+            converter.convert_parallel(output_dir, verbose=True)
     
     def _execute_chunk_parallel(self, output_dir, config):
         """청크 병렬 처리 실행"""
@@ -12,9 +12,37 @@ from multiprocessing import Pool, cpu_count
 import csv
 from pathlib import Path
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # python 3.7 이하: 워커가 공유 문자열을 직접 파싱
+    shared_memory = None
+
 # 원본 xlsx2csv 모듈
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from xlsx2csv import Xlsx2csv, XlsxException
+from xlsx2csv import Xlsx2csv, XlsxException, MappedStrings, SharedStrings
+
+
+# 워커 프로세스가 부모에게서 넘겨받아 재사용하는 파싱 결과 (Xlsx2csv 옵션으로 전달)
+_parsed_parts = {}
+
+
+def attach_parsed_parts(source, styles):
+    """
+    워커 초기화 함수: 부모가 공개한 공유 문자열과 스타일에 연결
+    
+    Args:
+        source: ('index', 인덱스 파일 경로) 또는 ('shm', 공유 메모리 이름)
+        styles: 부모가 파싱한 Styles
+    """
+    kind, name = source
+    if kind == 'index':
+        strings = MappedStrings.open(name)
+    else:
+        segment = shared_memory.SharedMemory(name=name)
+        strings = MappedStrings.from_buffer(segment.buf, segment)
+    _parsed_parts['shared_strings'] = SharedStrings(strings=strings)
+    _parsed_parts['styles'] = styles
 
 
 def process_single_sheet(args):
@@ -33,8 +61,8 @@ def process_single_sheet(args):
     sheet_name = sheet_info['name']
     
     try:
-        # 각 프로세스에서 독립적으로 xlsx 파일 열기
-        with Xlsx2csv(xlsxfile, **options) as xlsx2csv:
+        # 각 프로세스에서 독립적으로 xlsx 파일 열기 (공유 문자열 / 스타일은 부모 것을 재사용)
+        with Xlsx2csv(xlsxfile, **dict(options, **_parsed_parts)) as xlsx2csv:
             # 출력 파일 경로 설정
             if sys.version_info[0] == 2:
                 safe_sheet_name = sheet_name.encode('utf-8')
@@ -57,6 +85,9 @@ class Xlsx2csvParallel:
     멀티프로세싱을 지원하는 Xlsx2csv 래퍼 클래스
     
     여러 시트를 병렬로 처리하여 성능을 향상시킵니다.
+    공유 문자열과 스타일은 부모에서 한 번만 파싱하여 공유 메모리(또는 mmap 인덱스)로
+    워커에 공개하므로, 워커는 다시 파싱하지 않습니다.
+    사용 후 close() 를 호출하거나 with 문으로 사용하세요.
     """
     
     def __init__(self, xlsxfile, num_processes=None, **options):
@@ -70,10 +101,54 @@ class Xlsx2csvParallel:
         self.options = options
         self.num_processes = num_processes or cpu_count()
         
-        # xlsx 파일 정보 미리 로드
-        with Xlsx2csv(xlsxfile, **options) as xlsx2csv:
-            self.sheets = xlsx2csv.workbook.sheets
-            self.num_sheets = len(self.sheets)
+        # xlsx 파일 정보 미리 로드, 공유 문자열 / 스타일은 변환 시 한 번 파싱하여 워커에 넘기기 위해 유지
+        self.xlsx2csv = Xlsx2csv(xlsxfile, **options)
+        self.sheets = self.xlsx2csv.workbook.sheets
+        self.num_sheets = len(self.sheets)
+    
+    @property
+    def shared_strings(self):
+        return self.xlsx2csv.shared_strings
+    
+    @property
+    def styles(self):
+        return self.xlsx2csv.styles
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self):
+        """파싱 결과(및 mmap 인덱스)와 xlsx 파일 핸들 해제"""
+        xlsx2csv = getattr(self, 'xlsx2csv', None)
+        if xlsx2csv is not None:
+            xlsx2csv.close()
+            self.xlsx2csv = None
+    
+    def _publish_shared_strings(self):
+        """
+        공유 문자열을 워커가 연결할 수 있는 형태로 공개
+        
+        Returns:
+            (attach_parsed_parts 에 넘길 source, 작업 후 해제할 공유 메모리 또는 None)
+        """
+        strings = self.shared_strings.strings
+        if isinstance(strings, MappedStrings):
+            # mmap 인덱스는 이미 디스크에 있으므로 경로만 전달
+            return ('index', strings.path), None
+        segments = []
+        
+        def allocate(size):
+            segments.append(shared_memory.SharedMemory(create=True, size=max(size, 1)))
+            return segments[0].buf
+        
+        MappedStrings.pack(strings, allocate)
+        return ('shm', segments[0].name), segments[0]
     
     def convert_parallel(self, outdir, filter_sheets=None, verbose=True):
         """
@@ -117,7 +192,7 @@ class Xlsx2csvParallel:
                 self.xlsxfile,
                 sheets_to_process[0],
                 outdir,
-                self.options
+                dict(self.options, shared_strings=self.shared_strings, styles=self.styles)
             ))
             return [result[0]] if result[1] else []
         
@@ -135,8 +210,22 @@ class Xlsx2csvParallel:
         successful_sheets = []
         failed_sheets = []
         
-        with Pool(processes=num_workers) as pool:
-            results = pool.map(process_single_sheet, args_list)
+        # 공유 문자열 / 스타일 공개: 워커는 초기화 시 한 번 연결하고 파싱하지 않음
+        segment = None
+        initializer = None
+        initargs = ()
+        if shared_memory is not None or isinstance(self.shared_strings.strings, MappedStrings):
+            source, segment = self._publish_shared_strings()
+            initializer = attach_parsed_parts
+            initargs = (source, self.styles)
+        
+        try:
+            with Pool(processes=num_workers, initializer=initializer, initargs=initargs) as pool:
+                results = pool.map(process_single_sheet, args_list)
+        finally:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
         
         # 결과 집계
         for sheet_name, success, error in results:
@@ -225,8 +314,8 @@ def convert_xlsx_parallel(xlsxfile, outdir, num_processes=None, **options):
     Returns:
         성공한 시트 목록
     """
-    converter = Xlsx2csvParallel(xlsxfile, num_processes, **options)
-    return converter.convert_parallel(outdir, verbose=True)
+    with Xlsx2csvParallel(xlsxfile, num_processes, **options) as converter:
+        return converter.convert_parallel(outdir, verbose=True)
 
 
 def main():
@@ -259,12 +348,18 @@ def main():
         action='store_true',
         help='진행상황 출력 안함'
     )
+    parser.add_argument(
+        '--mmap-shared-strings',
+        action='store_true',
+        help='공유 문자열을 디스크 인덱스(mmap)로 한 번만 만들어 워커들이 공유'
+    )
     
     args = parser.parse_args()
     
     options = {
         'delimiter': ',',
-        'outputencoding': 'utf-8'
+        'outputencoding': 'utf-8',
+        'mmap_shared_strings': args.mmap_shared_strings
     }
     
     try:
@@ -285,6 +380,7 @@ def main():
                 args.output,
                 verbose=not args.quiet
             )
+        converter.close()
         
         print("\n✓ 변환 완료")
         return 0